@@ -30,7 +30,7 @@ class BeamSearch(Random):
 
     def reset_model(self) -> None:
         """Reset the model and queue of the BeamSearch class."""
-        self.initial_model = Model()
+        self.initial_model = Model(instance=self.initial_model.instance)
         self.queue = []
 
     def get_next_state(self) -> Model:
@@ -40,7 +40,7 @@ class BeamSearch(Random):
 
     def get_tot_penalty_possibilities(
         self, model: Model, index: int, n: int
-    ) -> list[tuple[str, str]]:
+    ) -> list[int]:
         """Gets n possible activities that would fit in specific index of a model.
         Possibilities are selected according to the total penalty.
 
@@ -50,7 +50,7 @@ class BeamSearch(Random):
             n (int): The beam width, how many possible activities should be returned.
 
         Returns:
-            list[Tuple(str,str)]: A list with activity tuples of length n.
+            list[int]: A list with activity ids of length n.
         """
         possibilities = {}
 
@@ -67,7 +67,7 @@ class BeamSearch(Random):
 
     def get_capacity_possibilities(
         self, model: Model, index: int, n: int
-    ) -> list[tuple[str, str]]:
+    ) -> list[int]:
         """Get n possible activities that would fit in specific index of a model.
 
         Possibilities are selected as possibilities according to capacity.
@@ -78,15 +78,17 @@ class BeamSearch(Random):
             n (int): The beam width specifying amount of possible activities to be returned.
 
         Returns:
-            list[Tuple(str,str)]: A list with activity tuples of length n.
+            list[int]: A list with activity ids of length n.
         """
         possibilities = {}
         no_possibilities = {}
         capacity = model.get_hall_capacity(index)
+        activity_capacities = model.activity_counts[model.unassigned_activities].tolist()
 
         # Check if activity capacity matches hall capacity
-        for activity in model.unassigned_activities:
-            activity_capacity = model.get_student_count_in_activity(activity)
+        for activity, activity_capacity in zip(
+            model.unassigned_activities, activity_capacities
+        ):
             if activity_capacity < capacity:
                 # If so, add activity to possibilities
                 possibilities.update({activity: activity_capacity})
@@ -98,7 +100,7 @@ class BeamSearch(Random):
 
     def sort_possibilities(
         self, n: int, possibilities: dict, no_possibilities={}, heuristic="capacity"
-    ) -> list[tuple[str, str]]:
+    ) -> list[int]:
         """Sort all possibilities according to heuristic and returns them.
 
         Args:
@@ -108,7 +110,7 @@ class BeamSearch(Random):
             heuristic (str): Defaults to  'capacity', second option is "totalpenalty".
 
         Returns:
-            list[Tuple(str,str)]: A list with activity tuples of length n.
+            list[int]: A list with activity ids of length n.
         """
 
         # If there are possibilities
@@ -132,7 +134,7 @@ class BeamSearch(Random):
 
     def get_possibilities(
         self, model: Model, index: int, n: int, heuristic="random"
-    ) -> list[tuple[str, str]]:
+    ) -> list[int]:
         """Get n possible activities that would fit in specific index of a model.
 
         Possibilities are be calculated according to heuristic.
@@ -145,7 +147,7 @@ class BeamSearch(Random):
                 Options are "random", "capacity", "totalpenalty". Defaults to 'random'.
 
         Returns:
-            list[Tuple(str,str)]: A list with activity tuples of length n.
+            list[int]: A list with activity ids of length n.
 
         """
 
@@ -23,7 +23,7 @@ class Greedy:
             sort_overlap (bool) : to optionally sort activities by amount of overlap with other activities.
         """
         self.model = empty_model.copy()
-        self.empty_slots = list(self.model.solution.keys())
+        self.empty_slots = self.model.get_empty_indices()
         if shuffle:
             self.model.shuffle_activities()
         elif sort:
@@ -35,7 +35,7 @@ class Greedy:
         """Finds the best index for a given activity based on penalty points.
 
         Args:
-            activity (tuple): Activity to find the optimal index for.
+            activity (int): Id of the activity to find the optimal index for.
             current_penalty (int): Penalty points of the current model.
 
         Returns:
@@ -67,7 +67,7 @@ class Greedy:
         """Inserts activity greedily.
 
         Args:
-            activity (tuple): activity to be inserted.
+            activity (int): id of the activity to be inserted.
             current_penalty (int): total penalty before insertion.
 
         Returns:
@@ -110,7 +110,7 @@ class RandomGreedy(Greedy):
         """Inserts activity at random index while considering room size.
 
         Args:
-            activity (tuple): activity to be inserted.
+            activity (int): id of the activity to be inserted.
 
         Returns:
             (int) total penalty after insertion.
@@ -128,7 +128,7 @@ class RandomGreedy(Greedy):
 
         Args:
             index (int)         : where activity would be inserted.
-            activity (tuple)    : activity to insert in room.
+            activity (int)      : id of the activity to insert in room.
             max_difference (int): max difference allowed between #students in activity and room capacity.
 
         Returns:
@@ -1,9 +1,10 @@
 from libraries.classes.model import Model
 from libraries.algorithms.randomise import Random
+from libraries.classes.slot_sampler import SlotSampler
+from libraries.classes.swap_delta_matrix import SwapDeltaMatrix
 import sys
 import numpy as np
 import csv
-import math
 from typing import Optional
 
 
@@ -13,16 +14,34 @@ class HillClimber(Random):
     Each improvement is kept for the next iteration.
     Improvements are based on a decrease in penalty points.
     This HillClimber is based on a stochastic HillCimber.
-    By running this HillClimber with steepest=True, it becomes a steepest ascend HillCLimber.
+    By running this HillClimber with the 'steepest' heuristic, it becomes a steepest descent
+    HillClimber, which evaluates every possible swap and applies the best one each iteration.
+
+    Mutations are applied in place to a single working model and undone when rejected,
+    using the swap journal of the model. best_model is only copied when a new best is found.
 
     This is a child of the Random() algorithm due to overlapping checking function and inits.
+
+    Swaps that cannot change the schedule, of an index with itself or of two empty indices,
+    are redrawn instead of evaluated.
+
+    Attributes:
+        weight_samplers (tuple[SlotSampler, SlotSampler] | None): Samplers of the push and
+            pull map of the current solution. Cached until a mutation is accepted,
+            None if not computed.
+        skip_equivalent_swaps (bool): Evaluate if swaps between halls of equal capacity
+            in the same timeslot are redrawn. These swaps never change the penalty points.
+        move_statistics (dict[str, int]): Counts of the swaps drawn in the last run.
+            Keys: "drawn", "no-op" and "equivalent" (both redrawn) and "applied".
     """
 
-    def __init__(self, valid_model: Model):
+    def __init__(self, valid_model: Model, *, skip_equivalent_swaps: bool = False):
         """Initialise the HillClimber algorithm.
 
         Args:
             valid_model (Model): A model with a filled in solution.
+            skip_equivalent_swaps (bool): Evaluate if swaps between halls of equal capacity
+                in the same timeslot are redrawn. Defaults to False.
 
         Raises:
             Exception: Provided solution is invalid.
@@ -31,27 +50,70 @@ class HillClimber(Random):
             raise Exception("Provided solution is not valid.")
         super().__init__(valid_model)
 
+        self.weight_samplers: Optional[tuple[SlotSampler, SlotSampler]] = None
+        self.skip_equivalent_swaps: bool = skip_equivalent_swaps
+        self.move_statistics: dict[str, int] = self.init_move_statistics()
+
+    def init_move_statistics(self) -> dict[str, int]:
+        """Return move statistics with every count at zero."""
+        return {"drawn": 0, "no-op": 0, "equivalent": 0, "applied": 0}
+
+    def check_no_op_swap(self, new_model: Model, index_1: int, index_2: int) -> bool:
+        """Return True if swapping the two indices leaves the schedule unchanged."""
+        return index_1 == index_2 or (
+            new_model.check_index_is_empty(index_1)
+            and new_model.check_index_is_empty(index_2)
+        )
+
+    def check_equivalent_slots(self, new_model: Model, index_1: int, index_2: int) -> bool:
+        """Return True if the indices are halls of equal capacity in the same timeslot.
+
+        Swapping such indices changes neither the capacity, evening nor student penalties.
+        """
+        return bool(
+            new_model.slot_day[index_1] == new_model.slot_day[index_2]
+            and new_model.slot_timeslot[index_1] == new_model.slot_timeslot[index_2]
+            and new_model.slot_capacity[index_1] == new_model.slot_capacity[index_2]
+        )
+
+    def check_solution(self, new_model: Model) -> bool:
+        """Accept better solutions than the current solution.
+
+        The mutated model keeps being mutated, so an improvement is stored as a copy.
+
+        Args:
+            new_model (Model): The working model with mutations.
+
+        Returns:
+            bool: True if new model has a lower score than the stored model, else False.
+        """
+        if new_model < self.best_model:
+            # Snapshot the new best model.
+            self.best_model = new_model.copy()
+            return True
+        return False
+
     def normalization_formula(
         self,
         highest_score: float,
         lowest_score: float,
-        score_to_update: float,
+        score_to_update: float | np.ndarray,
         steepest: bool = False,
-    ) -> float:
+    ) -> float | np.ndarray:
         """
         Calculates normalised weights based on scores in the model.
 
         Args:
             highest_score (float): The highest score stored.
             lowest_score (float): The lowest score stored.
-            score_to_update (float): The score to update.
+            score_to_update (float | np.ndarray): The score or array of scores to update.
             steepest (bool): Evaluate if only steepest points are to be swapped.
 
         Returns:
-            float: The score to update normalized to a value between 0 and 1.
+            float | np.ndarray: The score to update normalized to a value between 0 and 1.
         """
         if steepest is True:
-            score_to_update = math.log(score_to_update)
+            score_to_update = np.log(score_to_update)
         return (score_to_update - lowest_score) / (highest_score - lowest_score)
 
     def normalize_weights(
@@ -67,17 +129,10 @@ class HillClimber(Random):
             A NumPy array of list[float]. Each value has been normalized to a be
                 between 0 and 1.
         """
-        highest_penalty = max(weight_map)
-        lowest_penalty = min(weight_map)
-
-        normalized_scores: list[float] = []
-        for score in weight_map:
-            normalized_score = self.normalization_formula(
-                highest_penalty, lowest_penalty, score, steepest
-            )
-            normalized_scores.append(normalized_score)
+        scores = np.asarray(weight_map, dtype=float)
 
-        return np.array(normalized_scores)
+        # All scores are normalized at once.
+        return self.normalization_formula(scores.max(), scores.min(), scores, steepest)
 
     def increase_centre_weight(self, new_model, modifier: float = 1.2) -> list[float]:
         """Increase centre weight of day.
@@ -95,17 +150,13 @@ class HillClimber(Random):
         Returns:
             np.array: A list[float] of the increased scores after modification.
         """
-        new_scores: list[float] = []
-        for index, score in new_model.get_index_penalty_dict().items():
-            if 1 <= new_model.translate_index(index)["timeslot"] <= 2:
-                # Only timeslot 1 and 2 should recieve increased weights.
-                # Ensures modifier also applying on slots with no penalty score.
-                new_weights = (score + 1) * modifier
-                new_scores.append(new_weights)
-            else:
-                new_scores.append(score)
+        scores = np.array(list(new_model.get_index_penalty_dict().values()))
+
+        # Only timeslot 1 and 2 should recieve increased weights.
+        # Ensures modifier also applying on slots with no penalty score.
+        centre_slots = (new_model.slot_timeslot >= 1) & (new_model.slot_timeslot <= 2)
 
-        return np.array(new_scores)
+        return np.where(centre_slots, (scores + 1) * modifier, scores)
 
     def increase_weight_of_days(
         self, new_model: Model, day: int, modifier: float = 1.2
@@ -121,18 +172,11 @@ class HillClimber(Random):
         Returns:
             np.array: A list[float] of the increased scores after modification.
         """
-        new_weights: list[float] = []
-
-        for index, score in new_model.get_index_penalty_dict().items():
-            if new_model.translate_index(index)["day"] == day:
-                # Only increase the weights of the correct day.
-                # Ensures modifier also applying on slots with no penalty score.
-                new_score = (score + 1) * modifier
-                new_weights.append(new_score)
-            else:
-                new_weights.append(score)
+        scores = np.array(list(new_model.get_index_penalty_dict().values()))
 
-        return np.array(new_weights)
+        # Only increase the weights of the correct day.
+        # Ensures modifier also applying on slots with no penalty score.
+        return np.where(new_model.slot_day == day, (scores + 1) * modifier, scores)
 
     def heuristic_balancing(
         self,
@@ -196,28 +240,104 @@ class HillClimber(Random):
     def swap_slots(
         self,
         new_model: Model,
-        push_map: Optional[np.array] = None,
-        pull_map: Optional[np.array] = None,
+        push_sampler: Optional[SlotSampler] = None,
+        pull_sampler: Optional[SlotSampler] = None,
     ) -> None:
         """Swap two slots in the model at random.
 
-        The push_map and the pull_map respectively increase
+        The samplers of the push map and the pull map respectively increase
         the weight of high and low penalty locations.
 
         Args:
-            new_model (Model): A copy of the currently stored model with mutations.
-            push_map (np.array): A list of weights for each index.
+            new_model (Model): The working model with mutations.
+            push_sampler (SlotSampler): Sampler of the weights of each index.
                 Higher weights at an index means a greater likelihood the index is selected.
                 Defaults to None. Every index will then receive the same weight.
-            pull_map (np.array): A list of weights for each index.
+            pull_sampler (SlotSampler): Sampler of the weights of each index.
                 Higher weights at an index means a greater likelihood the index is selected.
                 Defaults to None. Every index will then receive the same weight.
         """
-        # Select two random indices to swap.
-        index_1 = new_model.get_random_index(weights=push_map)
-        index_2 = new_model.get_random_index(weights=pull_map)
+        # Select two random indices to swap, until the swap can change the schedule.
+        while True:
+            index_1 = new_model.get_random_index(sampler=push_sampler)
+            index_2 = new_model.get_random_index(sampler=pull_sampler)
+            self.move_statistics["drawn"] += 1
+
+            if self.check_no_op_swap(new_model, index_1, index_2) is True:
+                self.move_statistics["no-op"] += 1
+            elif (
+                self.skip_equivalent_swaps is True
+                and self.check_equivalent_slots(new_model, index_1, index_2) is True
+            ):
+                self.move_statistics["equivalent"] += 1
+            else:
+                break
+
+        self.move_statistics["applied"] += 1
+
+        # Swap and update the penalty points of the model incrementally.
+        new_model.apply_swap(index_1, index_2)
+
+    def get_weight_maps(
+        self,
+        new_model: Model,
+        heuristics: list[str],
+        modifier: float = 1.2,
+        steepest: bool = False,
+    ) -> tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """Compute the push and pull map of the heuristics for the current solution.
+
+        Args:
+            new_model (Model): The model on which the weights are based.
+            heuristics (list[str]): Heuristics to be used, see mutate_model().
+            modifier (float): Amount of weights to be assigned. Defaults to 1.2.
+            steepest (bool): Evaluate if algorithm has to only take each steepest climb.
+                    Defaults to False.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The push map and the pull map.
+                Both are None if no heuristic applies.
+        """
+        push_map = None
+        pull_map = None
+        if "middle" in heuristics:
+            push_map, pull_map = self.heuristic_balancing(
+                new_model,
+                centre_placement=True,
+                modifier=modifier,
+                steepest=steepest,
+            )
+        if "day" in heuristics:
+            conflict_map, gap_map = self.heuristic_balancing(
+                new_model, day_balancing=True, modifier=modifier, steepest=steepest
+            )
+            push_map += conflict_map
+            pull_map += gap_map
+        elif "balance" in heuristics:
+            push_map, pull_map = self.heuristic_balancing(
+                new_model,
+                modifier=modifier,
+                steepest=steepest,
+            )
 
-        new_model.swap_activities(index_1, index_2)
+        return push_map, pull_map
+
+    def get_weight_samplers(
+        self,
+        new_model: Model,
+        heuristics: list[str],
+        modifier: float = 1.2,
+        steepest: bool = False,
+    ) -> tuple[SlotSampler, SlotSampler]:
+        """Return samplers of the push and pull map of get_weight_maps().
+
+        A map of None results in a sampler giving every index the same weight.
+        """
+        n_slots = new_model.geometry.n_slots
+        push_map, pull_map = self.get_weight_maps(
+            new_model, heuristics, modifier, steepest
+        )
+        return SlotSampler(n_slots, push_map), SlotSampler(n_slots, pull_map)
 
     def mutate_model(
         self,
@@ -246,31 +366,20 @@ class HillClimber(Random):
             steepest (bool): Evaluate if algorithm has to only take each steepest climb.
                     Defaults to False. Will result in deterministic algorithm behaviour.
         """
-        push_map = None
-        pull_map = None
+        push_sampler = None
+        pull_sampler = None
         if heuristics is not None:
-            if "middle" in heuristics:
-                push_map, pull_map = self.heuristic_balancing(
-                    new_model,
-                    centre_placement=True,
-                    modifier=modifier,
-                    steepest=steepest,
-                )
-            if "day" in heuristics:
-                conflict_map, gap_map = self.heuristic_balancing(
-                    new_model, day_balancing=True, modifier=modifier, steepest=steepest
-                )
-                push_map += conflict_map
-                pull_map += gap_map
-            elif "balance" in heuristics:
-                push_map, pull_map = self.heuristic_balancing(
-                    new_model,
-                    modifier=modifier,
-                    steepest=steepest,
+            # The maps only change when a mutation is accepted.
+            if self.weight_samplers is None:
+                self.weight_samplers = self.get_weight_samplers(
+                    new_model, heuristics, modifier, steepest
                 )
+            push_sampler, pull_sampler = self.weight_samplers
 
         for _ in range(number_of_swaps):
-            self.swap_slots(new_model, push_map=push_map, pull_map=pull_map)
+            self.swap_slots(
+                new_model, push_sampler=push_sampler, pull_sampler=pull_sampler
+            )
 
     def run(
         self,
@@ -299,7 +408,9 @@ class HillClimber(Random):
                         high penalty scores towards the centre of the schedule (timeslot 11 & 1),
                     'days': Use weighted swapping to trade days containing
                         high gap penalties with days containing high conflict hour penalties.
-                    'steepest': Evaluate if algorithm has to only take each steepest climb.
+                    'steepest': Apply the best of all possible swaps each iteration,
+                        until no swap improves the solution. Ignores the other heuristics,
+                        convergence and mutate_slots_number.
                         Will result in deterministic algorithm behaviour.
             modifier (float): Effect a heuristic has on the heat map. Defaults to a multiplier of 1.5.
             verbose (bool): Evaluate if run prints current iteration and penalty score.
@@ -307,6 +418,10 @@ class HillClimber(Random):
             store_scores (bool): Evaluate if scores have to be stored for plotting. Defaults to false.
                 Will store scores in results/HillClimber Algorithm.csv.
         """
+        self.move_statistics = self.init_move_statistics()
+        if heuristics is not None and "steepest" in heuristics:
+            return self.run_steepest(iterations, verbose, store_scores)
+
         iteration_count: str | int = iterations
         if convergence != sys.maxsize:
             iterations = sys.maxsize
@@ -316,6 +431,11 @@ class HillClimber(Random):
 
         scores: list[int] = []
 
+        # Mutations are applied to the working model and undone if rejected.
+        model = self.best_model.copy()
+        model.start_journal()
+        self.weight_samplers = None
+
         convergence_counter = 0
         for iteration in range(iterations):
             self.iteration = iteration
@@ -327,24 +447,25 @@ class HillClimber(Random):
                 end="\r",
             ) if verbose else None
 
-            # Create a copy of the model to simulate a mutation.
-            new_model = self.best_model.copy()
+            # Mutations update the score of the model incrementally.
+            self.mutate_model(model, mutate_slots_number, heuristics, modifier)
 
-            self.mutate_model(new_model, mutate_slots_number, heuristics, modifier)
-
-            # Update the score of the model.
-            new_model.calc_total_penalty()
-
-            if self.check_solution(new_model) is True:
+            if self.check_solution(model) is True:
                 # Accept the mutation if it is an improvement.
+                model.commit_journal()
+                # The weight maps are based on the replaced solution.
+                self.weight_samplers = None
                 convergence_counter = 0
-            elif convergence_counter > convergence:
-                # Assume convergence has occured when solution remains the same for
-                #   a given value of convergence_counter.
-                break
+            else:
+                # Restore the model to the state before the mutation.
+                model.undo_journal()
+                if convergence_counter > convergence:
+                    # Assume convergence has occured when solution remains the same for
+                    #   a given value of convergence_counter.
+                    break
             convergence_counter += 1
 
-            scores.append(self.best_model.penalty_points)
+            scores.append(model.penalty_points)
             self.scores = scores
         if store_scores is True:
             with open(f"results/{self}.csv", "a+", newline="") as file:
@@ -352,5 +473,59 @@ class HillClimber(Random):
 
         return self.best_model, scores
 
+    def run_steepest(
+        self,
+        iterations: int = 2812,
+        verbose: bool = False,
+        store_scores: bool = False,
+    ) -> Model:
+        """Apply the best possible swap each iteration until a local optimum is reached.
+
+        The change in penalty points of every swap is kept in a SwapDeltaMatrix,
+            which is only partially updated after each applied swap.
+
+        Args:
+            iterations (int): Maximum number of swaps to apply. Defaults to 2812 iterations.
+            verbose (bool): Evaluate if run prints current iteration and penalty score.
+                Defaults to False.
+            store_scores (bool): Evaluate if scores have to be stored for plotting. Defaults to false.
+                Will store scores in results/HillClimber Algorithm.csv.
+        """
+        self.iterations = iterations
+
+        scores: list[int] = []
+
+        model = self.best_model.copy()
+        if model.penalty_points == float("inf"):
+            model.calc_total_penalty()
+        swap_deltas = SwapDeltaMatrix(model)
+
+        for iteration in range(iterations):
+            self.iteration = iteration
+
+            print(
+                f"Iteration {iteration}/{iterations} "
+                f"Current penalty score: {model.penalty_points}    ",
+                end="\r",
+            ) if verbose else None
+
+            index_1, index_2, delta = swap_deltas.get_best_swap()
+            if delta >= 0:
+                # No swap improves the solution, a local optimum is reached.
+                break
+
+            model.apply_swap(index_1, index_2)
+            swap_deltas.update(index_1, index_2)
+
+            scores.append(model.penalty_points)
+
+        self.best_model = model
+        self.scores = scores
+        if store_scores is True:
+            with open(f"results/{self}.csv", "a+", newline="") as file:
+                csv.writer(file).writerow(scores)
+
+        return self.best_model, scores
+
     def __repr__(self) -> str:
         return "HillClimber Algorithm"
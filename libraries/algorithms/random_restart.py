@@ -1,4 +1,5 @@
 from libraries.classes.model import Model
+from libraries.classes.problem_instance import ProblemInstance
 from libraries.helpers.random_restart_to_csv import to_csv
 from .hillclimber import HillClimber
 from .randomise import Random
@@ -23,6 +24,8 @@ def random_restart(
     verbose: int = 0,
     save: bool = False,
     store_runs: bool = False,
+    instance: Optional[ProblemInstance] = None,
+    skip_equivalent_swaps: bool = False,
 ):
     """Random Restart is a meta algorithm for a HillClimber or Simulated Annealing.
 
@@ -63,10 +66,17 @@ def random_restart(
             Will store files in /libraries/results/random_restart/<class algorithm version> model and scores.
         store_runs (bool): Evaluate if a list of scores for each run is to be returned instead of the best model.
             Defaults to false.
+        instance (ProblemInstance): Optional already loaded data, e.g. an instance shared
+            with worker processes. Defaults to None, which loads the data once for all runs.
+        skip_equivalent_swaps (bool): Evaluate if swaps between halls of equal capacity
+            in the same timeslot are redrawn. Defaults to False.
     """
     run_scores = []
     random.seed(seed)
-    best_model = Model()
+    # Load the data once and share it between the models of all runs.
+    if instance is None:
+        instance = ProblemInstance()
+    best_model = Model(instance=instance)
 
     verbosity = True if verbose >= 2 else False
     print(f"Starting PID Number {os.getpid()}")
@@ -75,7 +85,7 @@ def random_restart(
     for run in range(runs):
         start_time = time.time()
         # Generate a new random model.
-        random_model = Random(Model()).run()
+        random_model = Random(Model(instance=instance)).run()
         print(
             "\033[A",  # Go back 2 lines.
             f"Run {run}/{runs}, current penalty score: {best_model.penalty_points}",
@@ -83,10 +93,14 @@ def random_restart(
         ) if verbose >= 1 else None
 
         # Initialize the algorithm with the correct arguments.
-        try:
-            exe = algorithm(random_model, temperature)
-        except TypeError:
-            exe = algorithm(random_model)
+        if issubclass(algorithm, SimulatedAnnealing):
+            exe = algorithm(
+                random_model,
+                temperature=temperature,
+                skip_equivalent_swaps=skip_equivalent_swaps,
+            )
+        else:
+            exe = algorithm(random_model, skip_equivalent_swaps=skip_equivalent_swaps)
 
         # Run the algorithm.
         new_model, scores = exe.run(
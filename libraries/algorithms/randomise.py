@@ -16,12 +16,12 @@ class Random:
         self.initial_model = initial_model.copy()
         self.best_model = self.initial_model
 
-    def insert_randomly(self, activity_tuple, new_model) -> None:
-        """Insert activity in random slot."""
+    def insert_randomly(self, activity, new_model) -> None:
+        """Insert activity id in random slot."""
         # while-loop ensures activity is added
         while True:
-            random_slot = randrange(145)
-            if new_model.add_activity(random_slot, activity_tuple) is True:
+            random_slot = randrange(new_model.geometry.n_slots)
+            if new_model.add_activity(random_slot, activity) is True:
                 break
 
     def check_solution(self, new_model: Model) -> bool:
@@ -63,7 +63,7 @@ class Random:
             new_model = self.initial_model.copy()
 
             # Create random schedule.
-            for activity in new_model.activity_enrollments:
+            for activity in new_model.registry:
                 self.insert_randomly(activity, new_model)
 
             # Update penalty points of new model.
@@ -17,19 +17,27 @@ class SimulatedAnnealing(HillClimber):
     this is a child of the HillClimber algorithm.
     """
 
-    def __init__(self, model: Model, temperature: int | float = 3):
+    def __init__(
+        self,
+        model: Model,
+        temperature: int | float = 3,
+        *,
+        skip_equivalent_swaps: bool = False,
+    ):
         """Initialise the Simulated Annealing algorithm class.
 
         Args:
             model (Model): A model with a filled in solution.
             temperature (int): starting temperature which accepts changes.
                 Defaults to 3.
+            skip_equivalent_swaps (bool): Evaluate if swaps between halls of equal capacity
+                in the same timeslot are redrawn. Defaults to False.
 
         Raises:
             Exception: Provided solution is invalid."""
 
         # Use the init method of the Hillclimber parent class.
-        super().__init__(model)
+        super().__init__(model, skip_equivalent_swaps=skip_equivalent_swaps)
 
         # Starting temperature and current temperature
         self.T0 = temperature
@@ -66,21 +74,26 @@ class SimulatedAnnealing(HillClimber):
         Also sometimes accepts solutions that are worse, depending on the current
             temperature.
 
+        The best accepted model is stored as a copy.
+
         Args:
-            new_model (Model): A copy of the currently stored model with mutations.
+            new_model (Model): The working model with mutations.
 
         Returns:
             bool: True if new solution has been accepted, else False.
         """
 
-        # Calculate the probability of accepting this new solution
-        delta = new_model - self.best_model
+        # Calculate the probability of accepting this new solution,
+        #   based on the change of the mutations to the current solution.
+        delta = new_model.journal_delta()
         probability = math.exp(-delta / self.T)
 
         # Evaluate against a random number between 0 and 1
         #   if the new solution is accepted.
         if random.random() < probability:
-            self.best_model = new_model
+            if new_model < self.best_model:
+                # Snapshot the new best model.
+                self.best_model = new_model.copy()
             return True
 
         # Update the temperature
@@ -0,0 +1,80 @@
+from typing import Iterator
+
+
+class ActivityRegistry:
+    """Assigns dense integer ids to all activities of the loaded courses.
+
+    Algorithms refer to activities by their id. The names are kept for output.
+
+    Attributes:
+        names (list[tuple[str, str]]): A mapping of an activity id to an activity.
+            An activity is represented as ('Course name', 'Activity').
+            Example of an activity: ('Heuristieken 1', 'lecture 1').
+        ids (dict[tuple[str, str], int]): A mapping of an activity to its id.
+        course_names (list[str]): A mapping of a course id to a course name.
+        course_ids (dict[str, int]): A mapping of a course name to its course id.
+        activity_courses (list[int]): A mapping of an activity id to its course id.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self.names: list[tuple[str, str]] = []
+        self.ids: dict[tuple[str, str], int] = {}
+        self.course_names: list[str] = []
+        self.course_ids: dict[str, int] = {}
+        self.activity_courses: list[int] = []
+
+    def add(self, course_name: str, category: str) -> int:
+        """Register an activity and return its id.
+
+        Registering an activity that already exists returns the existing id.
+
+        Args:
+            course_name (str): Name of the course the activity belongs to.
+            category (str): Category of the activity, e.g. 'lecture 1'.
+        """
+        activity = (course_name, category)
+        if activity in self.ids:
+            return self.ids[activity]
+
+        id = len(self.names)
+        self.names.append(activity)
+        self.ids[activity] = id
+        self.activity_courses.append(self.add_course(course_name))
+
+        return id
+
+    def add_course(self, course_name: str) -> int:
+        """Register a course and return its course id.
+
+        Registering a course that already exists returns the existing course id.
+        Courses without activities are registered as well, so that every course has an id.
+        """
+        if course_name not in self.course_ids:
+            self.course_ids[course_name] = len(self.course_names)
+            self.course_names.append(course_name)
+
+        return self.course_ids[course_name]
+
+    def get_id(self, activity: tuple[str, str]) -> int:
+        """Return the id of an activity, e.g. ('Heuristieken 1', 'lecture 1')."""
+        return self.ids[activity]
+
+    def get_name(self, id: int) -> tuple[str, str]:
+        """Return the activity of an id. Negative ids return (None, None)."""
+        if id < 0:
+            return (None, None)
+        return self.names[id]
+
+    def get_course_name(self, id: int) -> str:
+        """Return the name of the course an activity id belongs to."""
+        return self.course_names[self.activity_courses[id]]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(len(self.names)))
+
+    def __repr__(self) -> str:
+        return f"ActivityRegistry of {len(self)} activities."
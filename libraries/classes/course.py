@@ -16,6 +16,8 @@ class Course:
         students (dict[str, Student]): Mapping of student indices to Student objects.
     """
 
+    __slots__ = ("name", "lectures", "tutorials", "practicals", "students")
+
     def __init__(self, course_name) -> None:
         """Initialize the Course with the relevant information.
 
@@ -0,0 +1,126 @@
+from typing import Optional
+from libraries.classes.hall import Hall
+import numpy as np
+
+
+class Geometry:
+    """The layout of the schedule slots of a week.
+
+    Each day contains every hall in every regular timeslot, ordered by timeslot and then hall,
+    followed by one evening slot for each hall that has an evening slot.
+    A schedule slot index maps to a day-timeslot-hall combination through the slot tables.
+
+    With the default configuration and the 7 halls of zalen.csv, a day contains
+    7 halls x 4 timeslots + 1 evening slot in the largest hall, which results in 145 slots.
+
+    Attributes:
+        n_days (int): Number of days in a week.
+        n_regular_timeslots (int): Number of timeslots in a day without the evening timeslot.
+        n_timeslots (int): Number of timeslots in a day, including the evening timeslot.
+        n_halls (int): Number of halls.
+        evening_halls (list[int]): Indices of the halls with an evening slot.
+        slots_per_day (int): Number of schedule slots in a day.
+        n_slots (int): Number of schedule slots in a week.
+        day_names (list[str]): Name of each day.
+        timeslot_names (list[str]): Name of each timeslot.
+        slot_day (np.ndarray): Day of each schedule slot index.
+        slot_timeslot (np.ndarray): Timeslot of each schedule slot index.
+        slot_hall (np.ndarray): Hall index of each schedule slot index.
+        slot_capacity (np.ndarray): Hall capacity of each schedule slot index.
+        evening_slots (np.ndarray): Boolean mask of the evening slot indices.
+        capacity_order (np.ndarray): Slot indices sorted from highest to lowest capacity.
+            Slots of equal capacity keep their index order.
+    """
+
+    def __init__(
+        self,
+        halls: "dict[int, Hall]",
+        days: int = 5,
+        timeslots: int = 4,
+        evening_halls: Optional[list[str]] = None,
+    ) -> None:
+        """Derive the slot layout from the halls and a configuration.
+
+        Args:
+            halls (dict[int, Hall]): Mapping of a hall index to a Hall object.
+            days (int): Number of days in a week. Defaults to 5.
+            timeslots (int): Number of regular timeslots in a day. Defaults to 4.
+            evening_halls (list[str]): Names of the halls with an evening slot.
+                Defaults to None, which gives the hall with the highest capacity an evening slot.
+
+        Raises:
+            ValueError: A hall with an evening slot does not exist.
+        """
+        hall_names = [hall.name for hall in halls.values()]
+        capacities = np.array([hall.capacity for hall in halls.values()])
+
+        if evening_halls is None:
+            evening_halls = [hall_names[int(np.argmax(capacities))]]
+        for name in evening_halls:
+            if name not in hall_names:
+                raise ValueError(f"Hall {name} with an evening slot does not exist.")
+
+        self.n_days: int = days
+        self.n_regular_timeslots: int = timeslots
+        self.n_timeslots: int = timeslots + (1 if evening_halls else 0)
+        self.n_halls: int = len(hall_names)
+        self.evening_halls: list[int] = [hall_names.index(name) for name in evening_halls]
+        self.slots_per_day: int = self.n_halls * timeslots + len(self.evening_halls)
+        self.n_slots: int = self.slots_per_day * days
+
+        self.day_names: list[str] = self.init_day_names()
+        self.timeslot_names: list[str] = [
+            f"{9 + 2 * timeslot}-{11 + 2 * timeslot}"
+            for timeslot in range(self.n_timeslots)
+        ]
+
+        self.init_slot_tables(capacities)
+
+    def init_day_names(self) -> list[str]:
+        """Return the weekday names, numbered names if there are more than 7 days."""
+        weekdays = [
+            "Monday",
+            "Tuesday",
+            "Wednesday",
+            "Thursday",
+            "Friday",
+            "Saturday",
+            "Sunday",
+        ]
+        if self.n_days <= len(weekdays):
+            return weekdays[: self.n_days]
+        return [f"Day {day + 1}" for day in range(self.n_days)]
+
+    def init_slot_tables(self, capacities: np.ndarray) -> None:
+        """Precompute the day, timeslot, hall and capacity of each schedule slot index.
+
+        Args:
+            capacities (np.ndarray): Capacity of each hall index.
+        """
+        # Layout of a single day: all halls per regular timeslot, then the evening slots.
+        day_hall = np.concatenate(
+            [
+                np.tile(np.arange(self.n_halls), self.n_regular_timeslots),
+                np.array(self.evening_halls, dtype=int),
+            ]
+        )
+        day_timeslot = np.concatenate(
+            [
+                np.repeat(np.arange(self.n_regular_timeslots), self.n_halls),
+                np.full(len(self.evening_halls), self.n_regular_timeslots),
+            ]
+        )
+
+        slots = np.arange(self.n_slots)
+        self.slot_day: np.ndarray = slots // self.slots_per_day
+        self.slot_timeslot: np.ndarray = day_timeslot[slots % self.slots_per_day]
+        self.slot_hall: np.ndarray = day_hall[slots % self.slots_per_day]
+        self.slot_capacity: np.ndarray = capacities[self.slot_hall]
+        self.evening_slots: np.ndarray = self.slot_timeslot == self.n_regular_timeslots
+        self.capacity_order: np.ndarray = np.argsort(-self.slot_capacity, kind="stable")
+
+    def __repr__(self) -> str:
+        return (
+            f"Geometry of {self.n_days} days x {self.n_timeslots} timeslots "
+            f"in {self.n_halls} halls, {self.n_slots} slots."
+        )
@@ -1,4 +1,6 @@
 class Hall:
+    __slots__ = ("name", "capacity")
+
     def __init__(self, name, capacity) -> None:
         self.name: str = name
         self.capacity: int = capacity
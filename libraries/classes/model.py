@@ -2,77 +2,201 @@ from __future__ import annotations
 from libraries.classes.student import Student
 from libraries.classes.course import Course
 from libraries.classes.hall import Hall
-from libraries.helpers.load_data import load_courses, load_students, load_halls
+from libraries.classes.activity_registry import ActivityRegistry
+from libraries.classes.problem_instance import ProblemInstance
+from libraries.classes.geometry import Geometry
+from libraries.classes.slot_sampler import SlotSampler
 from typing import Optional
-from collections import defaultdict
 import numpy as np
 import copy
 import random
 
 
+# Penalty of an activity in an evening slot, used by the full and the incremental score.
+EVENING_PENALTY = 5
+
+
 class Model:
     """A model representation for a schedule.
 
     Contains methods for manipulation of data in schedule indices and manipulation of members of activities.
 
+    The loaded data is stored in a ProblemInstance which is shared between models.
+    Courses, students, halls, the registry and enrollments are read from the instance.
+
     Attributes:
+        instance (ProblemInstance): The loaded data of the problem.
         courses (dict[str, Course]): A mapping of a course name to a Course object.
+            Built by the instance on first access.
         students (dict[str, Student]):
             A mapping of a student index (based on loading order) to a Student object.
+            Built by the instance on first access.
         halls (dict[str, Hall]):
             A mapping of a hall index (based on loading order) to a Hall object.
-        solution (dict[int, tuple[str, str]]): A mapping of a schedule slot index
-            (which maps to day-timeslot-hall) to an activity.
-            An activity is represented as ('Course name', 'Activity').
+        registry (ActivityRegistry): Assigns an integer id to each activity.
+            Activities are referred to by their id, the registry maps ids to names.
+            An activity name is represented as ('Course name', 'Activity').
             Example of an activity: ('Heuristieken 1', 'lecture 1').
-        activity_enrollments (dict[tuple[str, str], set[int]]):
-            A dictionary containing activities and their set of students.
+        activity_enrollments (list[set[int]]):
+            A list mapping an activity id to its set of students.
             Students are represented by their index number.
+        student_activities (list[list[int]]): A list mapping a student index to the
+            ids of the activities the student is enrolled in.
+        enrollment_matrix (np.ndarray): A boolean students x activities matrix.
+            True if the student (row) is enrolled in the activity (column).
+        activity_counts (np.ndarray): Number of students enrolled in each activity id.
+        geometry (Geometry): The layout of the schedule slots of the instance.
+        slot_day, slot_timeslot, slot_hall, slot_capacity (np.ndarray):
+            Day, timeslot, hall index and hall capacity of each schedule slot index.
+        evening_slots (np.ndarray): Boolean mask of the evening slot indices.
+        solution (dict[int, tuple[str, str]]): A dict view of the schedule derived
+            from slot_activity, mapping a schedule slot index to an activity name.
+        slot_activity (np.ndarray): An int16 array mapping a schedule slot index
+            (which maps to day-timeslot-hall) to an activity id. Empty slots hold -1.
+        activity_slot (np.ndarray): An int16 array mapping an activity id to its
+            schedule slot index (the reverse index of slot_activity).
+            Unplaced activities hold -1. Doubles as the placed-activity bitmap,
+            an activity is placed if its slot is not negative.
+        n_placed (int): Number of placed activities, kept up to date by
+            add_activity and clear_index.
+        free_slots (list[int]): The empty schedule slot indices, in no particular order.
+            Kept up to date by add_activity, clear_index and swap_activities.
+        free_slot_positions (list[int]): Position of each slot index in free_slots,
+            -1 for filled slots.
         penalty_per_index (dict[int, int]): Dictionary of penalty points per index.
             E.G. {'(timeslot) 0': 5 (penalty points)}.
-        penalties_per_student (dict[int, dict[int, dict[str, int]]]):
-            A mapping of student IDs to a dict of days which map to the conflict penalties and gap penalties.
-            Example: {(student) 0: {(day) 0: conflict penalties : 5, gap penalties : 2}.
-        unassigned_activities (list[tuple[str, str]]):
-            A list of activities which have not been placed in the solution.
+        shared_enrollments (bool): Evaluate if the instance is shared with other models.
+            A shared instance is copied before its enrollments are modified.
+            Read from the instance, so that whichever model modifies it first copies it.
+        occupancy (np.ndarray | None): Students x days x timeslots array of the number of
+            activities of each student in each timeslot. Kept up to date by apply_swap,
+            None if it has to be recalculated, see get_occupancy().
+        conflict_penalties_per_student (np.ndarray): Students x days array of conflict penalties.
+        gap_penalties_per_student (np.ndarray): Students x days array of gap penalties.
+        gap_penalty_table (np.ndarray): Gap penalty of each possible day of a student.
+            A day is represented as a bitmask, bit i is set if timeslot i is occupied.
+        unassigned_activities (list[int]):
+            A list of activity ids which have not been placed in the solution.
         penalty_points (int | float): Number of penalty points added together.
             Defaults to infinite on an empty model and is overwritten when model is filled.
+            Reset to infinite when the schedule or enrollments change outside apply_swap,
+            see invalidate_penalties().
+        journal (list[tuple] | None): Undo records of the swaps applied since the last
+            commit_journal(). None while no journal is kept, see start_journal().
     """
 
     def __init__(
-        self, path: str = "data", auto_load_students: bool = True
+        self,
+        path: str = "data",
+        auto_load_students: bool = True,
+        gap_penalty_table: Optional[np.ndarray] = None,
+        instance: Optional[ProblemInstance] = None,
     ) -> None:
         """Initiatizes a model for a schedule.
 
         Args:
             path (str): Path for data to load. Defaults to "data".
+                Ignored if an instance is given.
             auto_load_students (bool): evaluate if  students have to be added to
                 their respective activities in initialisation. Defaults to True.
+                Ignored if an instance is given.
+            gap_penalty_table (np.ndarray): Optional custom gap penalty of each day bitmask.
+                Defaults to the table of self.init_gap_penalty_table().
+            instance (ProblemInstance): Optional already loaded data to share.
+                Defaults to None, which loads a new instance from path.
         """
-        self.courses: dict[str, Course] = load_courses(path)
-        self.students: dict[int, Student] = load_students(self.courses, path)
-        self.halls: dict[int, Hall] = load_halls(path)
-        self.solution = self.init_model((None, None))
-        self.activity_enrollments: dict[
-            tuple[str, str], set[int]
-        ] = self.init_student_model()
-        self.penalty_per_index: dict[int, int] = self.init_model(0)
-        self.penalties_per_student: dict[
-            int, dict[int, dict[str, int]]
-        ] = defaultdict(dict)
-        self.unassigned_activities: list[tuple[str, str]] = list(
-            self.activity_enrollments.keys()
+        if instance is None:
+            instance = ProblemInstance(path, auto_load_students)
+        # A given instance may be used by other models as well.
+        instance.add_model()
+        self.instance: ProblemInstance = instance
+        self.slot_activity: np.ndarray = self.init_solution()
+        self.activity_slot: np.ndarray = np.full(
+            len(self.registry), -1, dtype=np.int16
         )
+        self.n_placed: int = 0
+        self.free_slots: list[int] = list(range(self.geometry.n_slots))
+        self.free_slot_positions: list[int] = list(range(self.geometry.n_slots))
+        self.penalty_per_index: dict[int, int] = self.init_model(0)
+        self.occupancy: Optional[np.ndarray] = None
+        self.conflict_penalties_per_student: np.ndarray = self.init_student_penalties()
+        self.gap_penalties_per_student: np.ndarray = self.init_student_penalties()
+        self.unassigned_activities: list[int] = list(self.registry)
 
         # Initiate an empty model with an improbably high score to ensure it always evaluates
         #   worse vs. other models. As an empty model contains no data,
         #   it can score no negative points and therefore would compare as better than
         #   a generated model.
         self.penalty_points: int | float = float("inf")
+        self.journal: Optional[list[tuple]] = None
+
+        self.gap_penalty_table: np.ndarray = self.init_gap_penalty_table()
+        if gap_penalty_table is not None:
+            self.set_gap_penalty_table(gap_penalty_table)
+
+    @property
+    def shared_enrollments(self) -> bool:
+        return self.instance.shared
+
+    @property
+    def courses(self) -> dict[str, Course]:
+        return self.instance.courses
+
+    @property
+    def students(self) -> dict[int, Student]:
+        return self.instance.students
+
+    @property
+    def halls(self) -> dict[int, Hall]:
+        return self.instance.halls
+
+    @property
+    def registry(self) -> ActivityRegistry:
+        return self.instance.registry
+
+    @property
+    def activity_enrollments(self) -> list[set[int]]:
+        return self.instance.activity_enrollments
 
-        if auto_load_students is True:
-            # Add members to activities in self.participants.
-            self.add_all_students_to_activities()
+    @property
+    def student_activities(self) -> list[list[int]]:
+        return self.instance.student_activities
+
+    @property
+    def enrollment_matrix(self) -> np.ndarray:
+        return self.instance.enrollment_matrix
+
+    @property
+    def activity_counts(self) -> np.ndarray:
+        return self.instance.activity_counts
+
+    @property
+    def overlap_matrix(self) -> np.ndarray:
+        return self.instance.overlap_matrix
+
+    @property
+    def geometry(self) -> Geometry:
+        return self.instance.geometry
+
+    @property
+    def slot_day(self) -> np.ndarray:
+        return self.geometry.slot_day
+
+    @property
+    def slot_timeslot(self) -> np.ndarray:
+        return self.geometry.slot_timeslot
+
+    @property
+    def slot_hall(self) -> np.ndarray:
+        return self.geometry.slot_hall
+
+    @property
+    def slot_capacity(self) -> np.ndarray:
+        return self.geometry.slot_capacity
+
+    @property
+    def evening_slots(self) -> np.ndarray:
+        return self.geometry.evening_slots
 
     def init_model(
         self, dict_value: int | tuple[Optional[str], Optional[str]]
@@ -81,57 +205,107 @@ class Model:
 
         Returns:
             dict[int : dict(str, str)]:
-                Index (0 - 144) mapping to a dict containing course and activity.
+                Index (0 - 144 by default) mapping to a dict containing course and activity.
                 Example: {0: {'course': 'Heuristieken', 'activity': 'lecture 1'},
                 {1: {'course': None, 'activity': None}, etc.}
         """
         schedule_model: dict[int, int | tuple[str, str]] = {
-            index: dict_value for index in range((7 * 4 + 1) * 5)
+            index: dict_value for index in range(self.geometry.n_slots)
         }
 
         return schedule_model
 
+    def init_solution(self) -> np.ndarray:
+        """Initiate an empty array representation of a schedule.
+
+        Returns:
+            np.ndarray: Index (0 - 144 by default) mapping to an activity id, -1 for every index.
+        """
+        return np.full(self.geometry.n_slots, -1, dtype=np.int16)
+
+    @property
+    def solution(self) -> dict[int, tuple[Optional[str], Optional[str]]]:
+        """Return a dict view of the schedule, derived from self.slot_activity.
+
+        Returns:
+            dict[int, tuple[str, str]]: Index (0 - 144) mapping to an activity.
+                Empty indices map to (None, None).
+        """
+        return {
+            index: self.get_activity_name(self.get_activity_of_index(index))
+            for index in range(len(self.slot_activity))
+        }
+
     def translate_index(self, index: int) -> dict[str, int]:
         """Return index value as day, timeslot and hall indices.
 
         Args:
-            index (int): Value 0-144 mapping to a day-hall-timeslot combination.
+            index (int): Schedule slot index mapping to a day-hall-timeslot combination.
         """
-        day = index // 29
-        timeslot = (index % 29) // 7
-        if (index % 29) == 28:
-            # Evening slot exception.
-            hall = 5
-        else:
-            # Regular hall indexing.
-            hall = (index % 29) % 7
+        return {
+            "day": int(self.slot_day[index]),
+            "timeslot": int(self.slot_timeslot[index]),
+            "hall": int(self.slot_hall[index]),
+        }
+
+    def init_student_penalties(self) -> np.ndarray:
+        """Initiate a students x days array of zero penalty points."""
+        return np.zeros((self.instance.n_students, self.geometry.n_days), dtype=np.int64)
 
-        return {"day": day, "timeslot": timeslot, "hall": hall}
+    def init_gap_penalty_table(self, third_gap_penalty: int = 5) -> np.ndarray:
+        """Initiate the gap penalty of each possible day of a student.
 
-    def init_student_model(self) -> dict[tuple[str, str], set[int]]:
-        """Initiate an activity mapping to a set of students.
+        A day is represented as a bitmask, bit i is set if timeslot i is occupied.
+        Each empty timeslot between the first and last activity of a day is a gap.
 
-        Activities are structured as a tuple('Heuristieken', 'lecture 1').
+        Args:
+            third_gap_penalty (int): Penalty if 3 or more gaps in a daily schedule.
+                Defaults to 5.
 
         Returns:
-            dict[tuple[str, str], set[str]]:
-                Activity (as unique tuple of course-activity) and a set of student indices.
+            np.ndarray: 2 ** timeslots penalty values, indexed by day bitmask.
         """
-        participants: dict[tuple[str, str], set[int]] = {}
-        for course in self.courses.values():
-            for activity in course.activities():
-                participants.update({(course.name, activity.category): set()})
+        n_timeslots = self.geometry.n_timeslots
+        gap_penalty_map = {0: 0, 1: 1, 2: 3}
+        table = np.zeros(2**n_timeslots, dtype=np.int64)
+        for mask in range(1, 2**n_timeslots):
+            timeslots = [
+                timeslot for timeslot in range(n_timeslots) if mask >> timeslot & 1
+            ]
+            gaps = timeslots[-1] - timeslots[0] + 1 - len(timeslots)
+            table[mask] = gap_penalty_map.get(gaps, third_gap_penalty)
+
+        return table
+
+    def set_gap_penalty_table(self, table: np.ndarray) -> None:
+        """Replace the gap penalty table with a custom table.
 
-        return participants
+        Args:
+            table (np.ndarray): 2 ** timeslots penalty values, indexed by day bitmask.
+
+        Raises:
+            ValueError: Table does not contain a value for each of the bitmasks.
+        """
+        table = np.asarray(table, dtype=np.int64)
+        n_masks = 2**self.geometry.n_timeslots
+        if table.shape != (n_masks,):
+            raise ValueError(f"Gap penalty table must contain {n_masks} values.")
+        self.gap_penalty_table = table
+        self.invalidate_penalties()
 
     def add_all_students_to_activities(self) -> None:
         """Add all students to activities."""
-        for activity_tuple in self.activity_enrollments:
-            for student in self.students:
-                self.add_student_to_activity(int(student), activity_tuple)
+        if self.shared_enrollments is True:
+            # Copy on write, other models keep the original enrollments.
+            self.unshare_enrollments()
+        self.invalidate_penalties()
+        self.instance.add_all_students_to_activities()
 
     def get_random_index(
-        self, empty: bool = False, weights: Optional[list[int]] = None
+        self,
+        empty: bool = False,
+        weights: Optional[list[int]] = None,
+        sampler: Optional[SlotSampler] = None,
     ) -> int:
         """Return random empty index in the schedule.
 
@@ -140,10 +314,23 @@ class Model:
                 Defaults to false.
             weights (list[int]): Weight to be assigned to each index.
                 Defaults to none, which results in equal weight for each index.
+            sampler (SlotSampler): Optional sampler to draw the index from,
+                reused between draws with the same weights. Overrides weights.
+
+        Raises:
+            ValueError: An empty index is requested, but the schedule is full.
         """
+        if empty is True and not self.free_slots:
+            raise ValueError("No empty index in the schedule.")
+        if empty is True and weights is None and sampler is None:
+            # Draw directly from the empty indices.
+            return self.free_slots[int(random.random() * len(self.free_slots))]
+
+        if sampler is None:
+            sampler = SlotSampler(self.geometry.n_slots, weights)
         while True:
             # Acquire index independent of content in index.
-            index = random.choices(list(self.solution.keys()), weights)[0]
+            index = sampler.sample()
             if empty is False:
                 # Return first found index if slot content is irrelevant.
                 return index
@@ -151,22 +338,24 @@ class Model:
                 return index
 
     def get_high_capacity_empty_index(self) -> int:
-        """Return empty index in the schedule with highest capacity."""
-        capacity = 0
-        highest_index = 0
-
-        for index in self.solution:
-            info = self.translate_index(index)
-            temp_capacity = self.halls[info["hall"]].capacity
-            if self.check_index_is_empty(index) and temp_capacity > capacity:
-                capacity = temp_capacity
-                highest_index = index
+        """Return empty index in the schedule with highest capacity.
 
-        return highest_index
+        Of the empty indices with the highest capacity, the first index is returned.
+        Returns 0 if no index is empty.
+        """
+        order = self.geometry.capacity_order
+        empty = self.slot_activity[order] < 0
+        if not empty.any():
+            return 0
+        return int(order[np.argmax(empty)])
 
     def check_index_is_empty(self, index: int) -> bool:
         """Return a boolean indicating if index slot contains a course-activity pair."""
-        return self.solution[index][0] is None
+        return bool(self.slot_activity[index] < 0)
+
+    def get_empty_indices(self) -> list[int]:
+        """Return a list of all empty indices in the schedule."""
+        return np.flatnonzero(self.slot_activity < 0).tolist()
 
     def get_index_penalty_dict(self) -> dict[int, int]:
         return self.penalty_per_index
@@ -174,43 +363,299 @@ class Model:
     def swap_activities(self, index_1, index_2) -> None:
         """Swap activities stored at two indices.
 
+        The stored penalties are marked out of date, apply_swap swaps and updates them instead.
+
         Args:
             index_1 (int): Index of first activity to be swapped.
             index_2 (int): Index of second activity to be swapped.
         """
-        self.solution[index_1], self.solution[index_2] = (
-            self.solution[index_2],
-            self.solution[index_1],
+        self._swap_slots(index_1, index_2)
+        self.invalidate_penalties()
+
+    def _swap_slots(self, index_1, index_2) -> None:
+        """Swap activities stored at two indices, leaving the stored penalties as they are."""
+        activity_1 = self.slot_activity[index_1]
+        activity_2 = self.slot_activity[index_2]
+        self.slot_activity[index_1] = activity_2
+        self.slot_activity[index_2] = activity_1
+
+        # Keep the inverse mapping up to date.
+        if activity_1 >= 0:
+            self.activity_slot[activity_1] = index_2
+        if activity_2 >= 0:
+            self.activity_slot[activity_2] = index_1
+
+        if (activity_1 < 0) != (activity_2 < 0):
+            # The empty index moved, it takes the place of the other in free_slots.
+            empty, filled = (index_1, index_2) if activity_1 < 0 else (index_2, index_1)
+            position = self.free_slot_positions[empty]
+            self.free_slots[position] = filled
+            self.free_slot_positions[filled] = position
+            self.free_slot_positions[empty] = -1
+
+    def swap_delta(self, index_1: int, index_2: int) -> int:
+        """Return the change in penalty points caused by swapping two indices.
+
+        Only the two swapped slots and the students enrolled in the two activities
+        on the affected days are evaluated. The model is left unchanged.
+
+        Args:
+            index_1 (int): Index of first activity to be swapped.
+            index_2 (int): Index of second activity to be swapped.
+
+        Returns:
+            int: Penalty points after the swap minus penalty points before the swap.
+        """
+        if index_1 == index_2:
+            return 0
+        return self.calc_swap(index_1, index_2)[0]
+
+    def calc_swap(self, index_1: int, index_2: int) -> tuple:
+        """Evaluate a swap of two indices without modifying the model.
+
+        Only the students enrolled in the two activities are evaluated, on the days of
+        the two indices. Their occupancy after the swap is derived from the stored
+        occupancy by moving the two activities, instead of rebuilding it from the schedule.
+
+        Args:
+            index_1 (int): Index of first activity to be swapped.
+            index_2 (int): Index of second activity to be swapped.
+
+        Returns:
+            tuple: The change in penalty points, the index of the affected students x days
+                block, the occupancy of the block before and after the swap, the conflict
+                and gap penalties of the block after the swap and the penalties of both
+                indices after the swap.
+        """
+        activity_1 = int(self.slot_activity[index_1])
+        activity_2 = int(self.slot_activity[index_2])
+        students = self.get_affected_students(index_1, index_2)
+        days = self.get_affected_days(index_1, index_2)
+
+        # Same as np.ix_(students, days), without its overhead on every swap.
+        block = (students[:, None], np.array(days))
+        before = self.get_occupancy()[block]
+        after = before.copy()
+        enrollments = self.enrollment_matrix
+        for activity, index_from, index_to in (
+            (activity_1, index_1, index_2),
+            (activity_2, index_2, index_1),
+        ):
+            if activity < 0:
+                continue
+            enrolled = enrollments[students, activity]
+            after[
+                enrolled,
+                days.index(self.slot_day[index_from]),
+                self.slot_timeslot[index_from],
+            ] -= 1
+            after[
+                enrolled,
+                days.index(self.slot_day[index_to]),
+                self.slot_timeslot[index_to],
+            ] += 1
+
+        conflicts_before, gaps_before = self.calc_day_penalties(before)
+        conflicts, gaps = self.calc_day_penalties(after)
+        index_penalties = (
+            self.calc_index_penalty(index_1, activity_2),
+            self.calc_index_penalty(index_2, activity_1),
+        )
+
+        delta = (
+            sum(index_penalties)
+            - self.calc_index_penalty(index_1, activity_1)
+            - self.calc_index_penalty(index_2, activity_2)
+            + int(conflicts.sum() + gaps.sum())
+            - int(conflicts_before.sum() + gaps_before.sum())
         )
 
-    def add_activity(self, index: int, activity: tuple[str, str]) -> bool:
+        return delta, block, before, after, conflicts, gaps, index_penalties
+
+    def apply_swap(self, index_1: int, index_2: int) -> int:
+        """Swap activities stored at two indices and update penalties incrementally.
+
+        The stored penalty points, penalties per index, penalties per student and
+            occupancy are updated from a single evaluation of the swap, without
+            rescanning the schedule. A model without stored penalty points is scored
+            in full first.
+
+        Args:
+            index_1 (int): Index of first activity to be swapped.
+            index_2 (int): Index of second activity to be swapped.
+
+        Returns:
+            int: Change in penalty points caused by the swap.
+        """
+        if self.penalty_points == float("inf"):
+            # No stored score to update, score the schedule before the swap.
+            self.calc_total_penalty()
+
+        (
+            delta,
+            block,
+            before,
+            after,
+            conflicts,
+            gaps,
+            index_penalties,
+        ) = self.calc_swap(index_1, index_2)
+
+        if self.journal is not None:
+            # Store the penalties overwritten by the swap, to restore them on undo.
+            self.journal.append(
+                (
+                    index_1,
+                    index_2,
+                    self.penalty_per_index[index_1],
+                    self.penalty_per_index[index_2],
+                    block,
+                    before,
+                    self.conflict_penalties_per_student[block],
+                    self.gap_penalties_per_student[block],
+                    delta,
+                )
+            )
+
+        self._swap_slots(index_1, index_2)
+        self.occupancy[block] = after
+
+        self.penalty_per_index[index_1] = index_penalties[0]
+        self.penalty_per_index[index_2] = index_penalties[1]
+        self.conflict_penalties_per_student[block] = conflicts
+        self.gap_penalties_per_student[block] = gaps
+
+        self.penalty_points += delta
+
+        return delta
+
+    def invalidate_penalties(self) -> None:
+        """Mark the stored penalties as out of date after the schedule or enrollments changed.
+
+        The penalty points are reset to infinite, so that apply_swap and start_journal
+            score the schedule again instead of updating a stale score.
+        Recorded swaps are committed, their undo records hold penalties of the old schedule.
+        """
+        self.penalty_points = float("inf")
+        self.occupancy = None
+        self.commit_journal()
+
+    def start_journal(self) -> None:
+        """Record the swaps applied by apply_swap, so that they can be undone.
+
+        The model is scored first if it has no stored penalty points, as undo
+            restores the incrementally updated penalties.
+        """
+        if self.penalty_points == float("inf"):
+            self.calc_total_penalty()
+        self.journal = []
+
+    def commit_journal(self) -> None:
+        """Accept the swaps recorded since the last commit, they can no longer be undone."""
+        if self.journal is not None:
+            self.journal = []
+
+    def undo_journal(self) -> None:
+        """Undo the swaps recorded since the last commit, in reverse order.
+
+        The schedule and all stored penalties are restored without recalculation.
+        """
+        if self.journal is None:
+            return
+        while self.journal:
+            (
+                index_1,
+                index_2,
+                penalty_1,
+                penalty_2,
+                block,
+                occupancy_block,
+                conflicts,
+                gaps,
+                delta,
+            ) = self.journal.pop()
+            self._swap_slots(index_1, index_2)
+            self.occupancy[block] = occupancy_block
+            self.penalty_per_index[index_1] = penalty_1
+            self.penalty_per_index[index_2] = penalty_2
+            self.conflict_penalties_per_student[block] = conflicts
+            self.gap_penalties_per_student[block] = gaps
+            self.penalty_points -= delta
+
+    def stop_journal(self) -> None:
+        """Stop recording swaps, the recorded swaps are kept."""
+        self.journal = None
+
+    def journal_delta(self) -> int:
+        """Return the change in penalty points of the swaps recorded since the last commit."""
+        if self.journal is None:
+            return 0
+        return sum(record[-1] for record in self.journal)
+
+    def get_affected_students(self, index_1: int, index_2: int) -> np.ndarray:
+        """Return the students enrolled in the activities stored at two indices."""
+        students: set[int] = set()
+        for index in (index_1, index_2):
+            if self.check_index_is_empty(index) is False:
+                students |= self.activity_enrollments[
+                    self.get_activity_of_index(index)
+                ]
+
+        return np.fromiter(students, dtype=np.intp, count=len(students))
+
+    def get_affected_days(self, index_1: int, index_2: int) -> list[int]:
+        """Return the sorted days of two indices, without duplicates."""
+        return sorted({int(self.slot_day[index_1]), int(self.slot_day[index_2])})
+
+    def calc_index_penalty(self, index: int, activity: int) -> int:
+        """Return the capacity and evening penalty of an activity stored at index.
+
+        Args:
+            index (int): Index in the model.
+            activity (int): Id of the activity, -1 for no activity.
+        """
+        penalty = self.calc_capacity_penalty_at_(index, activity)
+        if activity >= 0 and self.evening_slots[index]:
+            penalty += EVENING_PENALTY
+        return penalty
+
+    def add_activity(self, index: int, activity: int) -> bool:
         """Add activity to given index in schedule model.
 
+        Args:
+            index (int): Index in schedule, ranging from 0 - 144.
+            activity (int): Id of the activity.
+
         Returns:
-            bool: True if activity was succesfully added, else False.
+            bool: True if activity was succesfully added, False if the index is filled
+                or the activity is already placed at another index.
         """
-        if self.check_index_is_empty(index) is True:
-            self.solution[index] = activity
+        if (
+            self.check_index_is_empty(index) is True
+            and self.check_activity_is_placed(activity) is False
+        ):
+            self.n_placed += 1
+            self.slot_activity[index] = activity
+            self.activity_slot[activity] = index
+            self.remove_free_slot(index)
+            self.invalidate_penalties()
             return True
         else:
             return False
 
     def remove_activity(
         self,
-        activity: Optional[tuple[str, str]] = None,
+        activity: Optional[int] = None,
         index: Optional[int] = None,
     ) -> bool:
         """Remove activity from the schedule model.
 
-        Activities are structured as tuple("course name", "lecture 1).
-
         If only activity is given, index is searched and activity is removed at found index.
         If only index is given, activity at specified index is removed.
         If both are given, given activity is compared to stored activity before removal.
 
         Args:
-            activity (tuple[str, str]): course name, activity type.
-                Example: ("Heuristieken", "lecture 1)
+            activity (int): Id of the activity.
             index (int): Index in schedule, ranging from 0 - 144.
 
         Returns:
@@ -219,145 +664,184 @@ class Model:
         """
         if activity is not None and index is not None:
             # Check if stored activity and index match stored information.
-            check_index = self.get_index_of_activity(activity)
-            check_activity = self.get_activity_of_index(index)
-
-            if check_index == index and check_activity == activity:
+            if self.get_activity_of_index(index) == activity:
                 # Remove activity from stored index.
-                self.solution[index] = (None, None)
+                self.clear_index(index)
                 return True
             else:
                 return False
 
         elif activity is not None:
+            if self.check_activity_is_placed(activity) is False:
+                return False
             # Remove activity from stored index.
             index = self.get_index_of_activity(activity)
-            self.solution[index] = (None, None)
+            self.clear_index(index)
             return True
 
         elif index is not None:
             # Remove activity from stored index.
-            self.solution[index] = (None, None)
+            self.clear_index(index)
             return True
 
         return False
 
+    def clear_index(self, index: int) -> None:
+        """Empty the given index in the schedule and unplace its activity."""
+        id = self.slot_activity[index]
+        if id >= 0:
+            if self.check_activity_is_placed(id) is True:
+                self.n_placed -= 1
+            self.activity_slot[id] = -1
+            self.add_free_slot(index)
+            self.invalidate_penalties()
+        self.slot_activity[index] = -1
+
+    def add_free_slot(self, index: int) -> None:
+        """Append an index that became empty to free_slots."""
+        self.free_slot_positions[index] = len(self.free_slots)
+        self.free_slots.append(index)
+
+    def remove_free_slot(self, index: int) -> None:
+        """Remove an index that was filled from free_slots in constant time.
+
+        The last index of free_slots takes the place of the removed index.
+        """
+        position = self.free_slot_positions[index]
+        last = self.free_slots.pop()
+        if last != index:
+            self.free_slots[position] = last
+            self.free_slot_positions[last] = position
+        self.free_slot_positions[index] = -1
+
     def get_hall_capacity(self, index: int) -> int:
         """Return capacity of the hall that is represented by index."""
-        # Translate index into information
-        info = self.translate_index(index)
-        # Get the hall that is described by index
-        hall_index = info["hall"]
-        # Return hall capacity by from list
-        return self.halls[hall_index].capacity
-
-    def get_student_count_in_activity(self, activity: tuple[str, str]) -> int:
+        return int(self.slot_capacity[index])
+
+    def get_student_count_in_activity(self, activity: int) -> int:
         """Return the capacity of an activity.
 
-        If activity is None, return zero.
+        If activity is -1 (an empty index), return zero.
         """
-        # Start with capacity 0
-        capacity = 0
-        # Extract course name and type from activity
-        course_name = activity[0]
-        type = activity[1]
+        if activity < 0:
+            return 0
+        return int(self.activity_counts[activity])
+
+    def get_index_of_activity(self, activity: int) -> int:
+        """Return index of activity in model, looked up in the reverse index.
+
+        Args:
+            activity (int): Id of the activity.
 
-        if course_name and type:
-            # Find the course object the activity belongs to
-            course = self.courses[course_name]
-            # Combine all course activities in one list
-            all_activities = (
-                course.lectures + course.practicals + course.tutorials
+        Raises:
+            KeyError: Activity has not been placed in the model.
+        """
+        index = self.activity_slot[activity]
+        if index < 0:
+            raise KeyError(
+                f"{self.get_activity_name(activity)} has not been placed in the model."
             )
+        return int(index)
 
-            # Iterate over all Activity objects
-            for object in all_activities:
-                # If type matches Activity category
-                if type == object.category:
-                    # Set capacity
-                    capacity = len(
-                        self.activity_enrollments[(course_name, type)]
-                    )
+    def check_activity_is_placed(self, activity: int) -> bool:
+        """Return a boolean indicating if an activity id has been placed in the model."""
+        return bool(self.activity_slot[activity] >= 0)
 
-            return int(capacity)
-        else:
-            # If activity is None, return 0
-            return 0
+    def get_activity_indices(
+        self, names: bool = False
+    ) -> dict[int | tuple[str, str], int]:
+        """Return the index of every placed activity.
 
-    def get_index_of_activity(self, activity: tuple[str, str]) -> int:
-        """Return index of activity in model.
+        Reads the reverse index self.activity_slot, which is kept up to date by
+            add_activity, remove_activity and swap_activities.
 
         Args:
-            activity (tuple[str, str]): ('course name', 'lecture 1')
+            names (bool): Evaluate if activities are returned as names
+                instead of ids. Defaults to False.
+
+        Returns:
+            dict[int | tuple[str, str], int]: Activity mapping to its index.
+                E.g. {('Heuristieken', 'lecture 1'): 12}.
         """
-        return {
-            index
-            for index in self.solution
-            if self.solution[index] == activity
-        }.pop()
+        activity_indices: dict[int | tuple[str, str], int] = {}
+        for activity in np.flatnonzero(self.activity_slot >= 0):
+            key = self.get_activity_name(activity) if names else int(activity)
+            activity_indices[key] = int(self.activity_slot[activity])
+
+        return activity_indices
 
-    def get_activity_of_index(self, index: int) -> tuple[str, str]:
-        """Return activity stored at index in model.
+    def get_activity_of_index(self, index: int) -> int:
+        """Return id of the activity stored at index in model.
 
         Args:
             index (int): Value ranging from 0 - 144
+
+        Returns:
+            int: The activity id, -1 if index is empty.
+        """
+        return int(self.slot_activity[index])
+
+    def get_activity_name(self, activity: int) -> tuple[str, str]:
+        """Return the name of an activity id, e.g. ('Heuristieken', 'lecture 1').
+
+        Returns (None, None) for -1 (an empty index).
         """
-        return self.solution[index]
+        return self.registry.get_name(activity)
 
     def check_student_in_course(self, student: int, course) -> bool:
         """Return bool if student in specified course."""
-        return True if student in self.courses[course].students else False
+        return self.instance.check_student_in_course(student, course)
 
-    def add_student_to_activity(
-        self, student: int, activity: tuple[str, str]
-    ) -> bool:
+    def add_student_to_activity(self, student: int, activity: int) -> bool:
         """Add student to an activity in the model.
 
         Args:
             student (int): Index id of a student.
-            activity (tuple[str, str]) : tuple("course name", "lecture 1)
+            activity (int) : Id of the activity.
 
         Returns:
             bool: True if student not in activity yet, False otherwise.
         """
         if student not in self.activity_enrollments[
             activity
-        ] and self.check_student_in_course(student, activity[0]):
-            self.activity_enrollments[activity].add(student)
-            return True
+        ] and self.check_student_in_course(
+            student, self.registry.get_course_name(activity)
+        ):
+            if self.shared_enrollments is True:
+                # Copy on write, other models keep the original enrollments.
+                self.unshare_enrollments()
+            self.invalidate_penalties()
+            return self.instance.add_student_to_activity(student, activity)
         else:
             return False
 
-    def get_student_schedule(self, student: int) -> dict[int, tuple[str, str]]:
-        """Return a dict of schedule and activities of the student.
+    def get_student_schedule(self, student: int) -> dict[int, int]:
+        """Return a dict of schedule indices and activity ids of the student.
 
-        Example: {0: (Heuristieken, lecture 1), 1: (Algoritmes, werkcollege 1)}
+        Example: {0: 12 (activity id), 1: 40 (activity id)}
 
         Args:
             student (int): Index id of the student.
         """
-        activities = [
-            activity
-            for activity, student_list in self.activity_enrollments.items()
-            if student in student_list
-        ]
-        activity_and_indices: dict[int, tuple[str, str]] = {
-            index: activity
-            for index, activity in self.solution.items()
-            if activity in activities
+        activity_and_indices: dict[int, int] = {
+            int(self.activity_slot[activity]): activity
+            for activity in self.student_activities[student]
+            if self.activity_slot[activity] >= 0
         }
         return activity_and_indices
 
-    def get_penalties_per_day(self, type="str") -> dict[int, dict[str, int]]:
-        """Return a dictionary of conflict and gap penalty of each day."""
-        penalty_per_day: dict[int, dict[str, int]] = {i: 0 for i in range(5)}
-        for student_penalty in self.penalties_per_student.values():
-            for day, penalties in student_penalty.items():
-                for penalty_type, penalty_value in penalties.items():
-                    if penalty_type == type:
-                        penalty_per_day[day] += penalty_value
+    def get_penalties_per_day(self, type="str") -> dict[int, int]:
+        """Return a dictionary of conflict or gap penalty of each day.
+
+        Args:
+            type (str): "conflict penalties" or "gap penalties".
+        """
+        if type == "conflict penalties":
+            penalties = self.conflict_penalties_per_student
+        else:
+            penalties = self.gap_penalties_per_student
 
-        return penalty_per_day
+        return {day: int(value) for day, value in enumerate(penalties.sum(axis=0))}
 
     def get_worst_days(self) -> dict[str, int]:
         """Return the day of highest gap penalties and the day of highest conflict penalties."""
@@ -398,19 +882,18 @@ class Model:
             for index, value in model.items():
                 if value == high_value:
                     activity = self.get_activity_of_index(index)
-                    highest_penalties.update({index: activity})
+                    highest_penalties.update(
+                        {index: self.get_activity_name(activity)}
+                    )
 
         return highest_penalties
 
-    def calc_capacity_penalty_at_(
-        self, index: int, activity: tuple[str, str]
-    ) -> int:
+    def calc_capacity_penalty_at_(self, index: int, activity: int) -> int:
         """Return the capacity penalty for an activity over capacity.
 
         Args:
             index (int): Index of the activity in the model.
-            activity (tuple[str, str]): Activity to check,
-                an activity is a tuple of ('course name', 'activity').
+            activity (int): Id of the activity to check, -1 for no activity.
 
          Returns:
             int: Penalty points for each student over capacity. 0 if there is no penalty.
@@ -436,15 +919,22 @@ class Model:
         Returns:
             int: The sum of all capacity penalties.
         """
-        penalty_points = 0
+        penalties = self.calc_capacity_penalties()
+        # Add penalty values to dictionary of penalties per index.
+        self.penalty_per_index.update(enumerate(penalties.tolist()))
+
+        return int(penalties.sum())
 
-        for index, activity in self.solution.items():
-            index_penalty = self.calc_capacity_penalty_at_(index, activity)
-            penalty_points += index_penalty
-            # Add penalty value to dictionary of penalties per index.
-            self.penalty_per_index[index] = index_penalty
+    def calc_capacity_penalties(self) -> np.ndarray:
+        """Return the capacity penalty of every index at once.
 
-        return penalty_points
+        The penalty of an index is max(count[activity] - capacity[index], 0),
+            empty indices have no penalty.
+        """
+        counts = np.where(
+            self.slot_activity >= 0, self.activity_counts[self.slot_activity], 0
+        )
+        return np.maximum(counts - self.slot_capacity, 0)
 
     def calc_evening_penalties(self) -> int:
         """Penalize activities in evening slots.
@@ -454,56 +944,96 @@ class Model:
         Returns:
             int: The sum of all evening penalties.
         """
-        penalty_points = 0
-        evening_penalty = 5
+        evening_indices = np.flatnonzero(self.evening_slots & (self.slot_activity >= 0))
 
-        for index in self.solution:
-            if self.check_index_is_empty(index) is False:
-                index_info = self.translate_index(index)
-                if index_info["timeslot"] == 4:
-                    # Penalize for being in last timeslot.
-                    penalty_points += evening_penalty
-                    # Add penalty to stored dict of penalties.
-                    self.penalty_per_index[index] += evening_penalty
+        for index in evening_indices:
+            # Add penalty to stored dict of penalties.
+            self.penalty_per_index[int(index)] += EVENING_PENALTY
 
-        return penalty_points
+        return EVENING_PENALTY * len(evening_indices)
 
-    def calc_student_course_conflict(self, daily_schedule: list[int]) -> int:
-        """Calculate the number of overlapping timeslots for a student.
+    def get_placement_matrix(self, days: Optional[list[int]] = None) -> np.ndarray:
+        """Return a one-hot matrix of activities to day-timeslot combinations.
 
         Args:
-            daily_schedule (list[int]): List of timeslots at which student has activities.
+            days (list[int]): Days to include as columns. Defaults to all days.
+
+        Returns:
+            np.ndarray: An activities x (days * timeslots) matrix.
+                Holds 1 where a placed activity occurs on a day and timeslot.
         """
-        return len(
-            [
-                element
-                for element in daily_schedule
-                if daily_schedule.count(element) > 1
-            ]
+        n_days = self.geometry.n_days
+        n_timeslots = self.geometry.n_timeslots
+        if days is None:
+            days = list(range(n_days))
+        # Position of each day in the columns, -1 for days left out.
+        day_positions = np.full(n_days, -1)
+        day_positions[days] = np.arange(len(days))
+
+        placement = np.zeros(
+            (len(self.registry), len(days) * n_timeslots), dtype=np.int16
         )
+        activities = np.flatnonzero(self.activity_slot >= 0)
+        slots = self.activity_slot[activities]
+        positions = day_positions[self.slot_day[slots]]
+        included = positions >= 0
+        columns = positions[included] * n_timeslots + self.slot_timeslot[slots[included]]
+        placement[activities[included], columns] = 1
 
-    def remove_duplicates(self, schedule: list[int]) -> list[int]:
-        """Ensure each conflict only counted once.
+        return placement
 
-        Args:
-            schedule (list[int]): List of timeslots ranging from 0 to 4."""
-        return list(set(schedule))
+    def calc_occupancy(
+        self,
+        students: Optional[np.ndarray] = None,
+        days: Optional[list[int]] = None,
+    ) -> np.ndarray:
+        """Calculate the number of activities of students in each timeslot of each day.
 
-    def calc_student_gap_penalty(
-        self, daily_schedule: list[int], third_gap_penalty: int = 5
-    ) -> int:
-        """ "Calculate gap penalties for each student.
+        The occupancy is found by multiplying the enrollment matrix with the placement
+            matrix of the activities.
 
         Args:
-            daily_schedule (list[int]): List of timeslots in a day at which student has activities.
-            third_gap_penalty (int): Penalty if 3 gaps in a daily schedule. Defaults to 5.
+            students (np.ndarray): Student indices to include. Defaults to all students.
+            days (list[int]): Days to include. Defaults to all days.
+
+        Returns:
+            np.ndarray: A students x days x timeslots array.
         """
-        gap_penalty_map = {0: 0, 1: 1, 2: 3, 3: third_gap_penalty}
-        penalty_schedule = (
-            np.diff(np.sort(self.remove_duplicates(daily_schedule))) - 1
+        enrollments = self.enrollment_matrix
+        if students is not None:
+            enrollments = enrollments[students]
+
+        n_timeslots = self.geometry.n_timeslots
+        placement = self.get_placement_matrix(days)
+        return (enrollments @ placement).reshape(
+            len(enrollments), placement.shape[1] // n_timeslots, n_timeslots
         )
 
-        return gap_penalty_map[sum(penalty_schedule)]
+    def get_occupancy(self) -> np.ndarray:
+        """Return the stored occupancy of all students, calculated if it is out of date."""
+        if self.occupancy is None:
+            self.occupancy = self.calc_occupancy()
+        return self.occupancy
+
+    def calc_day_penalties(self, occupancy: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Calculate the conflict and gap penalties of days from their occupancy.
+
+        Each activity in a timeslot with more than one activity counts as a conflict.
+        Gap penalties are looked up in self.gap_penalty_table by the bitmask of
+            occupied timeslots of each day.
+
+        Args:
+            occupancy (np.ndarray): Number of activities of a student in each timeslot
+                of a day. Timeslots are on the last axis, any leading axes are kept.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Conflict penalties and gap penalties of each day.
+        """
+        conflicts = np.where(occupancy > 1, occupancy, 0).sum(axis=-1)
+
+        masks = (occupancy > 0) @ (1 << np.arange(occupancy.shape[-1]))
+
+        return conflicts, self.gap_penalty_table[masks]
 
     def calc_student_schedule_penalties(self) -> dict[str, int]:
         """Calculate gap and conflict penalties of each schedule of each student.
@@ -513,44 +1043,13 @@ class Model:
                 Value: Sum of each penalty.
 
         """
-        total_gap_penalties = 0
-        total_course_conflicts_penalties = 0
-
-        for id in self.students:
-            activities = self.get_student_schedule(id)
-
-            student_schedule: dict[int, list[int]] = {}
-
-            for activity in activities:
-                index_info = self.translate_index(activity)
-                student_schedule.setdefault(index_info["day"], []).append(
-                    index_info["timeslot"]
-                )
-
-            for day in student_schedule:
-                course_conflict_points = self.calc_student_course_conflict(
-                    student_schedule[day]
-                )
-                gap_penalty_points = self.calc_student_gap_penalty(
-                    student_schedule[day]
-                )
-                total_course_conflicts_penalties += course_conflict_points
-                total_gap_penalties += gap_penalty_points
-
-                self.penalties_per_student.update(
-                    {
-                        id: {
-                            day: {
-                                "conflict penalties": course_conflict_points,
-                                "gap penalties": gap_penalty_points,
-                            }
-                        }
-                    }
-                )
+        conflicts, gaps = self.calc_day_penalties(self.get_occupancy())
+        self.conflict_penalties_per_student = conflicts
+        self.gap_penalties_per_student = gaps
 
         return {
-            "conflict penalties": total_course_conflicts_penalties,
-            "gap penalties": total_gap_penalties,
+            "conflict penalties": int(conflicts.sum()),
+            "gap penalties": int(gaps.sum()),
         }
 
     def sum_student_schedule_penalties(self) -> int:
@@ -594,31 +1093,27 @@ class Model:
         Sorting occurs inplace in self.unassgined_activities.
         """
         self.unassigned_activities = sorted(
-            self.activity_enrollments,
+            self.registry,
             key=lambda key: len(self.activity_enrollments[key]),
             reverse=descending,
         )
 
     def calc_activity_overlap(
         self,
-        activity1: tuple[str, str],
-        activity2: tuple[str, str],
+        activity1: int,
+        activity2: int,
         student_overlap_value: bool = True,
     ) -> int:
         """ "Calculate the number of overlapping students or activities.
 
         Args:
-            activity1 (tuple[str, str]): 'Course Name', 'Activity'.
-            activity2 (tuple[str, str]): Same as activity1. E.G. ('Heuristieken', 'lecture 1')
+            activity1 (int): Id of the first activity.
+            activity2 (int): Id of the second activity.
             student_overlap_value (bool): Evaluate type of value to be returned. Defaults to true.
                 On true will return the number of students enrolled in both activity1 and activity2.
                 Otherwise will return binary 1 if there is overlap, 0 if there is not.
         """
-        overlap = len(
-            self.activity_enrollments[activity1].intersection(
-                self.activity_enrollments[activity2]
-            )
-        )
+        overlap = int(self.overlap_matrix[activity1, activity2])
         if student_overlap_value is True:
             # Return number of overlapping students.
             return overlap
@@ -639,22 +1134,30 @@ class Model:
             student_overlap_value (bool): Sorts by number of overlapping students if True.
                 Defaults to true. If False, only counts overlapping activities.
         """
-        overlap_count = dict.fromkeys(
-            (activity for activity in self.activity_enrollments), 0
-        )
+        overlap = self.overlap_matrix
+        if student_overlap_value is False:
+            overlap = overlap > 0
 
-        for activity1 in self.activity_enrollments:
-            for activity2 in self.activity_enrollments:
-                if activity1[0] != activity2[0]:
-                    # Ensure activities from different courses.
-                    overlap_count[activity1] += self.calc_activity_overlap(
-                        activity1, activity2, student_overlap_value
-                    )
+        # Only count overlap with activities from different courses.
+        activity_courses = np.asarray(self.registry.activity_courses)
+        other_course = activity_courses[:, None] != activity_courses[None, :]
+        overlap_count = np.where(other_course, overlap, 0).sum(axis=1).tolist()
 
         self.unassigned_activities = sorted(
-            overlap_count, key=lambda act: overlap_count[act], reverse=True
+            self.registry, key=lambda act: overlap_count[act], reverse=True
         )
 
+    def get_conflicting_activities(self, activity: int) -> np.ndarray:
+        """Return the ids of the other activities that share students with an activity.
+
+        Args:
+            activity (int): Id of the activity.
+
+        Returns:
+            np.ndarray: Ids of the activities with at least one student in common.
+        """
+        return self.instance.get_conflicting_activities(activity)
+
     def shuffle_activities(self) -> None:
         """Shuffles unassigned activities in place."""
         self.unassigned_activities = random.sample(
@@ -662,18 +1165,40 @@ class Model:
         )
 
     def copy(self) -> "Model":
-        """Return a copy of the model."""
+        """Return a copy of the model.
+
+        Only the solution and its penalties are copied. The instance is shared
+            with the copy.
+        """
         new_copy = copy.copy(self)
-        new_copy.solution = copy.copy(self.solution)
-        new_copy.activity_enrollments = copy.deepcopy(
-            self.activity_enrollments
+        new_copy.slot_activity = self.slot_activity.copy()
+        new_copy.activity_slot = self.activity_slot.copy()
+        new_copy.free_slots = list(self.free_slots)
+        new_copy.free_slot_positions = list(self.free_slot_positions)
+        new_copy.penalty_per_index = copy.copy(self.penalty_per_index)
+        new_copy.conflict_penalties_per_student = (
+            self.conflict_penalties_per_student.copy()
         )
-        new_copy.unassigned_activities = [
-            copy.deepcopy(tuple) for tuple in self.unassigned_activities
-        ]
+        new_copy.gap_penalties_per_student = self.gap_penalties_per_student.copy()
+        if self.occupancy is not None:
+            new_copy.occupancy = self.occupancy.copy()
+        new_copy.unassigned_activities = list(self.unassigned_activities)
+        # A copy starts without the swaps recorded by this model.
+        new_copy.journal = None
+
+        # Enrollments are shared until either model modifies them.
+        self.instance.add_model()
 
         return new_copy
 
+    def unshare_enrollments(self) -> None:
+        """Give the model a private copy of the instance shared with other models."""
+        shared_instance = self.instance
+        self.instance = shared_instance.copy()
+        self.instance.add_model()
+        shared_instance.remove_model()
+        self.invalidate_penalties()
+
     def check_valid_schedule_of_student(self, student: int) -> bool:
         """Evaluate if all activities of a student have been assigned to an index in the model.
 
@@ -683,36 +1208,70 @@ class Model:
         Returns:
             bool: True if all activities of the student have been assigned, False otherwise.
         """
-        person = self.students[student]
-        activities = set()
-        for course in person.courses.values():
-            for activity in course.activities():
-                activities.add((course.name, activity.category))
+        courses = self.instance.student_courses[student]
+        activities = set(
+            np.flatnonzero(courses[self.registry.activity_courses]).tolist()
+        )
         if activities == set(self.get_student_schedule(student).values()):
             return True
         return False
 
     def is_solution(self) -> bool:
-        """Evaluate if the solution is valid."""
-        # Evaluate if a student with 5 courses has
-        #   all activities scheduled in the solution.
-        if self.check_valid_schedule_of_student(0) is False:
-            return False
+        """Evaluate if the solution is valid.
 
-        # Evaluate if the number of activities is
-        #   equal or greater than the standard set of activities.
-        n_activities = 0
-        for course in self.courses.values():
-            n_activities += len(course.activities())
+        A solution is valid if every activity has been placed. The number of placed
+        activities is tracked by the model, which makes this an O(1) check.
+        Use validate() to check the model exhaustively.
+        """
+        return self.n_placed == len(self.registry)
 
-        activity_set = set()
-        for activity in self.solution.values():
-            activity_set.add(activity)
+    def validate(self) -> bool:
+        """Exhaustively evaluate if the solution is valid, for debugging.
 
-        if n_activities <= len(activity_set):
-            return True
-        else:
-            return False
+        Checks the bookkeeping of the model against the schedule and the schedule
+            of every student, instead of relying on the tracked number of placed activities.
+        Every problem raises a ValueError describing it, the method never returns False.
+
+        Returns:
+            bool: True if every activity and the schedule of every student has been placed.
+
+        Raises:
+            ValueError: The schedule, its reverse index, the placed count and the free slots
+                disagree, or an activity or the schedule of a student has not been placed.
+        """
+        placed_indices = np.flatnonzero(self.slot_activity >= 0)
+        placed = self.slot_activity[placed_indices]
+        if len(np.unique(placed)) != len(placed):
+            raise ValueError("An activity is placed at more than one index.")
+        if np.any(self.activity_slot[placed] != placed_indices):
+            raise ValueError("Reverse index does not match the schedule.")
+        if np.count_nonzero(self.activity_slot >= 0) != len(placed):
+            raise ValueError("Reverse index contains activities not in the schedule.")
+        if self.n_placed != len(placed):
+            raise ValueError(
+                f"Tracked {self.n_placed} placed activities, schedule holds {len(placed)}."
+            )
+        if sorted(self.free_slots) != np.flatnonzero(self.slot_activity < 0).tolist():
+            raise ValueError("Free slots do not match the empty indices of the schedule.")
+        for position, index in enumerate(self.free_slots):
+            if self.free_slot_positions[index] != position:
+                raise ValueError(f"Free slot {index} is not stored at its position.")
+
+        if len(placed) != len(self.registry):
+            raise ValueError(
+                f"{len(self.registry) - len(placed)} activities have not been placed."
+            )
+        for student in range(self.instance.n_students):
+            if self.check_valid_schedule_of_student(student) is False:
+                raise ValueError(f"The schedule of student {student} is incomplete.")
+
+        return True
+
+    def __del__(self) -> None:
+        # Release the instance, so that it is no longer shared with this model.
+        instance = getattr(self, "instance", None)
+        if instance is not None:
+            instance.remove_model()
 
     def __repr__(self) -> str:
         return f"Model penalty points: {self.penalty_points}."
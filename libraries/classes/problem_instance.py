@@ -0,0 +1,336 @@
+from __future__ import annotations
+from libraries.classes.student import Student
+from libraries.classes.course import Course
+from libraries.classes.hall import Hall
+from libraries.classes.activity_registry import ActivityRegistry
+from libraries.classes.geometry import Geometry
+from libraries.helpers.load_data import (
+    load_tables,
+    load_student_table,
+    load_registry,
+    build_courses,
+    build_students,
+)
+from typing import Optional, TYPE_CHECKING
+import numpy as np
+import tempfile
+import shutil
+import copy
+
+
+# Arrays that are written to memory-mapped files by ProblemInstance.share().
+SHARED_ARRAYS = ["student_courses", "enrollment_matrix"]
+
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class ProblemInstance:
+    """The loaded data of a timetabling problem.
+
+    A ProblemInstance is loaded once and shared by every Model solving it.
+    Models treat it as immutable: a model copies the instance before it changes enrollments.
+
+    The csv files are loaded in bulk into tables and matrices. The Course and Student
+    objects are only built from the tables when courses or students is first accessed.
+    A binary snapshot of path compiled by load_data.compile_data is loaded instead
+    of the csv files while it is up to date.
+
+    For worker processes, share() moves the large arrays to memory-mapped files.
+    A shared instance is pickled as the paths of these files, so every worker
+    maps the same memory instead of loading its own copy of the data.
+
+    Attributes:
+        path (str): Path of the loaded data.
+        course_table (dict[str, np.ndarray]): The courses in vakken.csv,
+            mapping each column name to an array with a value per course.
+        student_table (pd.DataFrame): The students in studenten_en_vakken.csv, one row per student.
+            Loaded on first access.
+        n_students (int): Number of students.
+        student_courses (np.ndarray): A boolean students x courses matrix.
+            True if the student (row) takes the course (column, a course id of the registry).
+        courses (dict[str, Course]): A mapping of a course name to a Course object.
+            Built on first access.
+        students (dict[int, Student]):
+            A mapping of a student index (based on loading order) to a Student object.
+            Built on first access.
+        halls (dict[int, Hall]):
+            A mapping of a hall index (based on loading order) to a Hall object.
+        registry (ActivityRegistry): Assigns an integer id to each activity.
+        activity_enrollments (list[set[int]]):
+            A list mapping an activity id to its set of students.
+            Students are represented by their index number.
+        student_activities (list[list[int]]): A list mapping a student index to the
+            ids of the activities the student is enrolled in.
+        enrollment_matrix (np.ndarray): A boolean students x activities matrix.
+            True if the student (row) is enrolled in the activity (column).
+        activity_counts (np.ndarray): Number of students enrolled in each activity id.
+        overlap_matrix (np.ndarray): An activities x activities matrix of the number of
+            students enrolled in both activities, the conflict graph of the activities.
+            Computed on first access and whenever the enrollments changed since.
+        geometry (Geometry): The layout of the schedule slots, derived from the halls.
+        n_models (int): Number of models that use the instance. A model is counted by
+            add_model() and released by remove_model() once it no longer uses the instance.
+        shared (bool): True if more than one model uses the instance or its arrays are
+            memory-mapped. A model copies a shared instance before it modifies enrollments,
+            see Model.unshare_enrollments().
+        shared_directory (str | None): Directory of the memory-mapped arrays of a shared
+            instance. None if the instance is not shared.
+    """
+
+    def __init__(
+        self,
+        path: str = "data",
+        auto_load_students: bool = True,
+        days: int = 5,
+        timeslots: int = 4,
+        evening_halls: Optional[list[str]] = None,
+    ) -> None:
+        """Load a problem instance from the csv files in path.
+
+        Args:
+            path (str): Path for data to load. Defaults to "data".
+            auto_load_students (bool): evaluate if  students have to be added to
+                their respective activities in initialisation. Defaults to True.
+            days (int): Number of days in a week. Defaults to 5.
+            timeslots (int): Number of regular timeslots in a day. Defaults to 4.
+            evening_halls (list[str]): Names of the halls with an evening slot.
+                Defaults to None, which gives the hall with the highest capacity an evening slot.
+        """
+        self.path: str = path
+        # Loaded from the compiled snapshot of path if it is up to date.
+        tables = load_tables(path)
+        self.course_table: dict[str, np.ndarray] = tables[0]
+        self.student_courses: np.ndarray = tables[1]
+        self.halls: dict[int, Hall] = tables[2]
+        self.n_students: int = len(self.student_courses)
+        self.registry: ActivityRegistry = load_registry(self.course_table)
+        self._student_table: Optional[pd.DataFrame] = None
+        self._courses: Optional[dict[str, Course]] = None
+        self._students: Optional[dict[int, Student]] = None
+
+        self.activity_enrollments: list[set[int]] = [set() for _ in self.registry]
+        self.student_activities: list[list[int]] = [[] for _ in range(self.n_students)]
+        self.enrollment_matrix: np.ndarray = np.zeros(
+            (self.n_students, len(self.registry)), dtype=bool
+        )
+        self.activity_counts: np.ndarray = np.zeros(len(self.registry), dtype=np.int64)
+        self._overlap_matrix: Optional[np.ndarray] = None
+
+        self.geometry: Geometry = Geometry(self.halls, days, timeslots, evening_halls)
+        self.n_models: int = 0
+        self.shared_directory: Optional[str] = None
+
+        if auto_load_students is True:
+            self.add_all_students_to_activities()
+
+    @property
+    def student_table(self) -> pd.DataFrame:
+        if self._student_table is None:
+            self._student_table = load_student_table(self.path)
+        return self._student_table
+
+    @property
+    def courses(self) -> dict[str, Course]:
+        if self._courses is None:
+            self._courses = build_courses(self.course_table)
+        return self._courses
+
+    @property
+    def students(self) -> dict[int, Student]:
+        if self._students is None:
+            self._students = build_students(self.courses, self.student_table)
+        return self._students
+
+    @property
+    def shared(self) -> bool:
+        # Memory-mapped arrays are shared with other processes and read-only.
+        return self.n_models > 1 or self.shared_directory is not None
+
+    def add_model(self) -> None:
+        """Count a model that starts using the instance."""
+        self.n_models += 1
+
+    def remove_model(self) -> None:
+        """Release a model that no longer uses the instance."""
+        self.n_models = max(self.n_models - 1, 0)
+
+    @property
+    def overlap_matrix(self) -> np.ndarray:
+        if self._overlap_matrix is None:
+            self._overlap_matrix = self.calc_overlap_matrix()
+        return self._overlap_matrix
+
+    def calc_overlap_matrix(self) -> np.ndarray:
+        """Count the students shared by each pair of activities.
+
+        The counts are the product of the transposed enrollment matrix with itself.
+        The diagonal holds the number of students enrolled in each activity.
+
+        Returns:
+            np.ndarray: An activities x activities matrix of shared student counts.
+        """
+        # A float32 product uses BLAS and is exact for up to 2**24 students.
+        enrollments = self.enrollment_matrix.astype(np.float32)
+        return (enrollments.T @ enrollments).astype(np.int64)
+
+    def get_conflicting_activities(self, activity: int) -> np.ndarray:
+        """Return the ids of the other activities that share students with an activity."""
+        conflicts = self.overlap_matrix[activity] > 0
+        conflicts[activity] = False
+        return np.flatnonzero(conflicts)
+
+    def add_all_students_to_activities(self) -> None:
+        """Add all students to the activities of their courses.
+
+        The enrollments of all students are derived at once from self.student_courses.
+        """
+        self.enrollment_matrix |= self.student_courses[:, self.registry.activity_courses]
+        self.init_enrollment_lists()
+
+    def init_enrollment_lists(self) -> None:
+        """Derive the enrollments per activity and per student from the enrollment matrix."""
+        self._overlap_matrix = None
+        self.activity_counts = self.enrollment_matrix.sum(axis=0, dtype=np.int64)
+        self.activity_enrollments = [
+            set(np.flatnonzero(students).tolist()) for students in self.enrollment_matrix.T
+        ]
+        self.student_activities = [
+            np.flatnonzero(activities).tolist() for activities in self.enrollment_matrix
+        ]
+
+    def check_student_in_course(self, student: int, course: str) -> bool:
+        """Return bool if student in specified course."""
+        return bool(self.student_courses[student, self.registry.course_ids[course]])
+
+    def add_student_to_activity(self, student: int, activity: int) -> bool:
+        """Add student to an activity.
+
+        Args:
+            student (int): Index id of a student.
+            activity (int) : Id of the activity.
+
+        Returns:
+            bool: True if student not in activity yet, False otherwise.
+        """
+        if student not in self.activity_enrollments[
+            activity
+        ] and self.check_student_in_course(
+            student, self.registry.get_course_name(activity)
+        ):
+            self.activity_enrollments[activity].add(student)
+            self.student_activities[student].append(activity)
+            self.enrollment_matrix[student, activity] = True
+            self.activity_counts[activity] += 1
+            self._overlap_matrix = None
+            return True
+        else:
+            return False
+
+    def copy(self) -> "ProblemInstance":
+        """Return a copy of the instance with private enrollments.
+
+        Courses, students, halls and the registry are shared with the copy.
+        The copy is not used by any model yet.
+        """
+        new_copy = copy.copy(self)
+        new_copy.activity_enrollments = [
+            set(students) for students in self.activity_enrollments
+        ]
+        new_copy.student_activities = [
+            list(activities) for activities in self.student_activities
+        ]
+        # A copy of a memory-mapped matrix is a private in-memory array.
+        new_copy.enrollment_matrix = np.array(self.enrollment_matrix)
+        new_copy.activity_counts = self.activity_counts.copy()
+        new_copy.n_models = 0
+
+        return new_copy
+
+    def share(self, directory: Optional[str] = None) -> None:
+        """Move the large arrays of the instance to read-only memory-mapped files.
+
+        Worker processes that receive the instance map the same files, the operating
+        system keeps a single copy of the data in memory for all processes.
+        Call release() when no process uses the instance anymore.
+
+        Args:
+            directory (str): Directory to write the arrays to.
+                Defaults to None, which creates a temporary directory.
+        """
+        if self.shared_directory is not None:
+            return
+        if directory is None:
+            directory = tempfile.mkdtemp(prefix="problem_instance_")
+
+        for name in SHARED_ARRAYS:
+            np.save(f"{directory}/{name}.npy", getattr(self, name))
+            setattr(self, name, None)
+        self.shared_directory = directory
+        self.map_shared_arrays()
+
+    def map_shared_arrays(self) -> None:
+        """Map the arrays in self.shared_directory read-only into memory.
+
+        Only arrays that are not loaded yet (None) are mapped.
+        """
+        for name in SHARED_ARRAYS:
+            if getattr(self, name, None) is None:
+                array = np.load(f"{self.shared_directory}/{name}.npy", mmap_mode="r")
+                setattr(self, name, array)
+
+    def release(self) -> None:
+        """Remove the memory-mapped files of a shared instance.
+
+        The arrays are copied back into memory first, so the instance stays usable.
+        """
+        if self.shared_directory is None:
+            return
+        for name in SHARED_ARRAYS:
+            setattr(self, name, np.array(getattr(self, name)))
+        shutil.rmtree(self.shared_directory, ignore_errors=True)
+        self.shared_directory = None
+
+    def __copy__(self) -> "ProblemInstance":
+        """Return a shallow copy, bypassing the pickle state of a shared instance."""
+        new_copy = self.__class__.__new__(self.__class__)
+        new_copy.__dict__.update(self.__dict__)
+        return new_copy
+
+    def __getstate__(self) -> dict:
+        """Return the state to pickle, without the data that a worker can map or rebuild."""
+        state = self.__dict__.copy()
+        if self.shared_directory is None:
+            return state
+
+        for name in SHARED_ARRAYS:
+            if isinstance(state[name], np.memmap):
+                # The worker maps the array from the shared directory.
+                state[name] = None
+        if state["enrollment_matrix"] is None:
+            # Derived from the mapped enrollment matrix by the worker.
+            state["activity_enrollments"] = None
+            state["student_activities"] = None
+        # The object graph is rebuilt on demand.
+        state["_student_table"] = None
+        state["_courses"] = None
+        state["_students"] = None
+
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """Restore a pickled instance, mapping the arrays of a shared instance."""
+        self.__dict__.update(state)
+        if self.shared_directory is None:
+            return
+
+        self.map_shared_arrays()
+        if self.activity_enrollments is None:
+            self.init_enrollment_lists()
+
+    def __repr__(self) -> str:
+        return (
+            f"ProblemInstance of {len(self.course_table['Vak'])} courses, "
+            f"{self.n_students} students and {len(self.halls)} halls."
+        )
@@ -0,0 +1,61 @@
+from typing import Optional, Sequence
+from bisect import bisect
+from math import floor
+import numpy as np
+import random
+
+
+class SlotSampler:
+    """Draws schedule slot indices at random, uniformly or proportional to weights.
+
+    The cumulative weights are computed once, so a weighted draw is a binary search
+    instead of rebuilding the weights for every draw as random.choices does.
+    Draws use the same random numbers as random.choices, a seeded run draws the same indices.
+
+    Attributes:
+        n (int): Number of slot indices to draw from, indices range from 0 to n - 1.
+        cum_weights (list[float] | None): Cumulative weight of each index.
+            None if every index has the same weight.
+        total (float): Sum of all weights, n if every index has the same weight.
+    """
+
+    def __init__(self, n: int, weights: Optional[Sequence[float]] = None) -> None:
+        """Precompute the cumulative weights of the slot indices.
+
+        Args:
+            n (int): Number of slot indices.
+            weights (Sequence[float]): Weight of each index.
+                Defaults to None, which gives every index the same weight.
+
+        Raises:
+            ValueError: The weights do not match the indices or do not sum to a positive number.
+        """
+        self.n: int = n
+        self.cum_weights: Optional[list[float]] = None
+        self.total: float = float(n)
+
+        if weights is not None:
+            if len(weights) != n:
+                raise ValueError("The number of weights does not match the number of slots.")
+            # A cumulative sum adds the weights in order, as random.choices does.
+            self.cum_weights = np.cumsum(weights, dtype=float).tolist()
+            self.total = self.cum_weights[-1] + 0.0
+            if not self.total > 0.0:
+                raise ValueError("Total of weights must be greater than zero.")
+
+    def sample(self) -> int:
+        """Return a random slot index."""
+        if self.cum_weights is None:
+            return floor(random.random() * self.total)
+        return bisect(self.cum_weights, random.random() * self.total, 0, self.n - 1)
+
+    def sample_batch(self, k: int) -> list[int]:
+        """Return k random slot indices, drawn with replacement."""
+        return [self.sample() for _ in range(k)]
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __repr__(self) -> str:
+        kind = "uniform" if self.cum_weights is None else "weighted"
+        return f"SlotSampler of {self.n} slots, {kind}."
@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING
+from typing import Optional, TYPE_CHECKING
 from libraries.classes.course import Course
 
 if TYPE_CHECKING:
@@ -6,6 +6,21 @@ if TYPE_CHECKING:
 
 
 class Student:
+    """Contains the information of a student.
+
+    Student objects are only built on demand, the algorithms read the enrollments
+    of the ProblemInstance arrays. The activities dict is created on first use.
+    """
+
+    __slots__ = (
+        "index",
+        "first_name",
+        "last_name",
+        "student_number",
+        "courses",
+        "_activities",
+    )
+
     def __init__(
         self,
         index: int,
@@ -28,7 +43,13 @@ class Student:
         self.last_name: str = last_name
         self.student_number: int = student_number
         self.courses: dict[str, Course] = courses
-        self.activities: dict[str, Activity] = {}
+        self._activities: Optional[dict[str, Activity]] = None
+
+    @property
+    def activities(self) -> "dict[str, Activity]":
+        if self._activities is None:
+            self._activities = {}
+        return self._activities
 
     def add_course(self, course: Course):
         self.courses.update({course.name: course})
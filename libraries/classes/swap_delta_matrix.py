@@ -0,0 +1,220 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+from libraries.classes.model import EVENING_PENALTY
+import numpy as np
+
+if TYPE_CHECKING:
+    from libraries.classes.model import Model
+
+
+class SwapDeltaMatrix:
+    """The change in penalty points of every swap of two schedule slots of a model.
+
+    Entry [i, j] holds the penalty points after swapping slot i and slot j minus the
+    penalty points before, like Model.swap_delta(i, j). The matrix is symmetric.
+
+    The student penalties of a swap are derived from two tables per activity:
+    the change of the penalties of its students when it moves alone to a day-timeslot
+    position (move_penalties), and the part of that change caused by students who are
+    also enrolled in a second activity (pair_penalties). When two activities swap,
+    the schedule of a student enrolled in both does not change, so that part is subtracted.
+
+    After a swap is applied to the model, update() only recalculates the rows and
+    columns of the slots holding an activity that shares students with a swapped activity.
+
+    Attributes:
+        model (Model): The model of which the swaps are evaluated.
+        slot_positions (np.ndarray): Day-timeslot position of each slot index,
+            day * n_timeslots + timeslot.
+        occupancy (np.ndarray): Students x days x timeslots array of the number of
+            activities of each student in each timeslot.
+        day_penalties (np.ndarray): Students x days array of the conflict and gap
+            penalties of each student on each day.
+        add_penalties (np.ndarray): Students x days x timeslots array of the change of
+            the penalties of a student when an activity is added in a timeslot.
+        move_penalties (np.ndarray): (activities + 1) x positions array of the change of
+            penalties of the students of an activity moved to a position.
+            The last row belongs to an empty slot (-1) and is zero.
+        pair_penalties (np.ndarray): (activities + 1) x positions x (activities + 1) array
+            of the part of move_penalties of the students enrolled in a second activity.
+        deltas (np.ndarray): Slots x slots array of the change in penalty points of each swap.
+    """
+
+    def __init__(self, model: Model) -> None:
+        """Calculate the penalty change of every swap of the model.
+
+        Args:
+            model (Model): A model with a stored or calculable penalty score.
+        """
+        geometry = model.geometry
+        n_activities = len(model.registry)
+        n_positions = geometry.n_days * geometry.n_timeslots
+
+        self.model: Model = model
+        self.slot_positions: np.ndarray = (
+            geometry.slot_day * geometry.n_timeslots + geometry.slot_timeslot
+        )
+
+        n_students = model.instance.n_students
+        shape = (n_students, geometry.n_days, geometry.n_timeslots)
+        self.occupancy: np.ndarray = np.zeros(shape, dtype=np.int64)
+        self.day_penalties: np.ndarray = np.zeros(shape[:2], dtype=np.int64)
+        self.add_penalties: np.ndarray = np.zeros(shape, dtype=np.int64)
+        self.move_penalties: np.ndarray = np.zeros(
+            (n_activities + 1, n_positions), dtype=np.int64
+        )
+        self.pair_penalties: np.ndarray = np.zeros(
+            (n_activities + 1, n_positions, n_activities + 1), dtype=np.int64
+        )
+        self.deltas: np.ndarray = np.zeros(
+            (geometry.n_slots, geometry.n_slots), dtype=np.int64
+        )
+
+        self.update_students(np.arange(n_students))
+        self.update_activities(np.arange(n_activities))
+        self.update_rows(np.arange(geometry.n_slots))
+
+    def update_students(self, students: np.ndarray) -> None:
+        """Recalculate the occupancy and penalty tables of the given students."""
+        n_timeslots = self.model.geometry.n_timeslots
+        occupancy = self.model.calc_occupancy(students)
+        conflicts, gaps = self.model.calc_day_penalties(occupancy)
+        day_penalties = conflicts + gaps
+
+        # Add an activity in every timeslot of every day at once.
+        conflicts, gaps = self.model.calc_day_penalties(
+            occupancy[:, :, None, :] + np.eye(n_timeslots, dtype=np.int64)
+        )
+
+        self.occupancy[students] = occupancy
+        self.day_penalties[students] = day_penalties
+        self.add_penalties[students] = conflicts + gaps - day_penalties[:, :, None]
+
+    def update_activities(self, activities: np.ndarray) -> None:
+        """Recalculate the move and pair penalties of the given activities.
+
+        Requires the occupancy tables of the students of the activities to be up to date.
+        """
+        n_timeslots = self.model.geometry.n_timeslots
+        timeslots = np.eye(n_timeslots, dtype=np.int64)
+        enrollments = self.model.enrollment_matrix
+
+        for activity in activities:
+            index = self.model.activity_slot[activity]
+            students = np.flatnonzero(enrollments[:, activity])
+            if index < 0 or len(students) == 0:
+                # Unplaced activities and activities without students never change penalties.
+                self.move_penalties[activity] = 0
+                self.pair_penalties[activity] = 0
+                continue
+
+            day = self.model.slot_day[index]
+            timeslot = self.model.slot_timeslot[index]
+            current = self.day_penalties[students, day]
+
+            # The day of the activity without the activity.
+            removed = self.occupancy[students, day] - timeslots[timeslot]
+            conflicts, gaps = self.model.calc_day_penalties(removed)
+            remove_penalties = conflicts + gaps - current
+
+            # Moving to another day removes the activity from its day and adds it to the other.
+            moves = remove_penalties[:, None, None] + self.add_penalties[students]
+            # Moving within its day changes a single day.
+            conflicts, gaps = self.model.calc_day_penalties(
+                removed[:, None, :] + timeslots
+            )
+            moves[:, day] = conflicts + gaps - current[:, None]
+
+            moves = moves.reshape(len(students), -1)
+            self.move_penalties[activity] = moves.sum(axis=0)
+            self.pair_penalties[activity, :, :-1] = moves.T @ enrollments[students].astype(
+                np.int64
+            )
+
+    def update_rows(self, slots: np.ndarray) -> None:
+        """Recalculate the penalty change of every swap with one of the given slots.
+
+        Args:
+            slots (np.ndarray): Slot indices of which the row and column are recalculated.
+        """
+        model = self.model
+        # Empty slots hold -1, which indexes the last, empty, row of the tables.
+        activities = model.slot_activity.astype(np.intp)
+        positions = self.slot_positions
+        row_activities = activities[slots][:, None]
+        row_positions = positions[slots][:, None]
+
+        # Students of the row activity move to the column position and vice versa.
+        student_deltas = (
+            self.move_penalties[row_activities, positions]
+            + self.move_penalties[activities, row_positions]
+            - self.pair_penalties[row_activities, positions, activities]
+            - self.pair_penalties[activities, row_positions, row_activities]
+        )
+
+        counts = np.append(model.activity_counts, 0)
+        capacities = model.slot_capacity
+        current = np.maximum(counts[activities] - capacities, 0)
+        capacity_deltas = (
+            np.maximum(counts[activities] - capacities[slots][:, None], 0)
+            + np.maximum(counts[row_activities] - capacities, 0)
+            - current[slots][:, None]
+            - current
+        )
+
+        filled = (activities >= 0).astype(np.int64)
+        evening = model.evening_slots.astype(np.int64)
+        evening_deltas = EVENING_PENALTY * (
+            evening[slots][:, None] * filled
+            + evening * filled[slots][:, None]
+            - (evening * filled)[slots][:, None]
+            - evening * filled
+        )
+
+        deltas = student_deltas + capacity_deltas + evening_deltas
+        self.deltas[slots] = deltas
+        self.deltas[:, slots] = deltas.T
+
+    def update(self, index_1: int, index_2: int) -> None:
+        """Update the matrix after the activities of two slots have been swapped in the model.
+
+        Args:
+            index_1 (int): Index of the first swapped slot.
+            index_2 (int): Index of the second swapped slot.
+        """
+        model = self.model
+        moved = [
+            activity
+            for activity in (model.slot_activity[index_1], model.slot_activity[index_2])
+            if activity >= 0
+        ]
+        slots = {index_1, index_2}
+
+        if moved:
+            enrollments = model.enrollment_matrix
+            students = np.flatnonzero(enrollments[:, moved].any(axis=1))
+            # Every activity of a moved student has a changed schedule around it.
+            activities = np.flatnonzero(enrollments[students].any(axis=0))
+            activities = np.union1d(activities, moved)
+
+            self.update_students(students)
+            self.update_activities(activities)
+
+            placed = model.activity_slot[activities]
+            slots.update(placed[placed >= 0].tolist())
+
+        self.update_rows(np.array(sorted(slots)))
+
+    def get_best_swap(self) -> tuple[int, int, int]:
+        """Return the swap with the largest decrease in penalty points.
+
+        Of equal swaps, the one with the lowest indices is returned.
+
+        Returns:
+            tuple[int, int, int]: The two slot indices and the change in penalty points.
+        """
+        index_1, index_2 = np.unravel_index(np.argmin(self.deltas), self.deltas.shape)
+        return int(index_1), int(index_2), int(self.deltas[index_1, index_2])
+
+    def __repr__(self) -> str:
+        return f"SwapDeltaMatrix of {len(self.deltas)} slots."
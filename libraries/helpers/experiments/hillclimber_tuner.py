@@ -1,6 +1,7 @@
 from libraries.algorithms.hillclimber import HillClimber
 from libraries.algorithms.randomise import Random
 from libraries.classes.model import Model
+from libraries.classes.problem_instance import ProblemInstance
 import random
 import csv
 import sys
@@ -55,9 +56,10 @@ def iter_tuner(
     Returns:
         list[int]: A list at which iteration convergence was found."""
     random.seed(seed)
+    instance = ProblemInstance()
     converged_iterations: list[int] = []
     for _ in range(runs):
-        model = Random(Model()).run()
+        model = Random(Model(instance=instance)).run()
         converged_iteration = HillClimber_Tuner(model).run(
             convergence=convergence, verbose=verbose
         )
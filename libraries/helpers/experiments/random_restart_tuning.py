@@ -4,6 +4,8 @@ from libraries.helpers.experiments.hillclimber_tuner import (
 from libraries.algorithms.hillclimber import HillClimber
 from libraries.algorithms.simulated_annealing import SimulatedAnnealing
 from libraries.algorithms.random_restart import random_restart
+from libraries.classes.problem_instance import ProblemInstance
+from typing import Optional
 import multiprocessing
 import random
 import csv
@@ -13,6 +15,8 @@ def heuristic_tester(
     algorithm: HillClimber | SimulatedAnnealing,
     heuristic: list[str],
     results: dict,
+    instance: Optional[ProblemInstance] = None,
+    skip_equivalent_swaps: bool = False,
 ) -> None:
     """Wrapper function to compare heuristics.
 
@@ -22,6 +26,9 @@ def heuristic_tester(
         algorithm (HillClimber | SimulatedAnnealing): Type of argument to test heuristics on.
         heuristic (list[str]): list of heuristics to use. Can be 'days', 'middle', 'balance or a combination.'
         results (dict): a dictionary created by multiprocessing.Manager().dict().
+        instance (ProblemInstance): Optional data shared by pool_exe. Defaults to None.
+        skip_equivalent_swaps (bool): Evaluate if swaps between halls of equal capacity
+            in the same timeslot are redrawn. Defaults to False.
     """
     results[" ".join(heuristic)] = random_restart(
         algorithm=algorithm,
@@ -29,11 +36,17 @@ def heuristic_tester(
         heuristics=heuristic,
         verbose=2,
         store_runs=True,
+        instance=instance,
+        skip_equivalent_swaps=skip_equivalent_swaps,
     )
 
 
 def modifier_tester(
-    algorithm: HillClimber | SimulatedAnnealing, modifier: int, results: dict
+    algorithm: HillClimber | SimulatedAnnealing,
+    modifier: int,
+    results: dict,
+    instance: Optional[ProblemInstance] = None,
+    skip_equivalent_swaps: bool = False,
 ) -> None:
     """ "Wrapper function to compare modifiers.
 
@@ -43,6 +56,9 @@ def modifier_tester(
         algorithm (HillClimber | SimulatedAnnealing): Type of argument to test heuristics on.
         modifier (int): modifier to be applied to heuristics.
         results (dict): a dictionary created by multiprocessing.Manager().dict().
+        instance (ProblemInstance): Optional data shared by pool_exe. Defaults to None.
+        skip_equivalent_swaps (bool): Evaluate if swaps between halls of equal capacity
+            in the same timeslot are redrawn. Defaults to False.
     """
     results[modifier] = random_restart(
         algorithm=algorithm,
@@ -51,11 +67,17 @@ def modifier_tester(
         heuristics=["middle", "days"],
         verbose=2,
         store_runs=True,
+        instance=instance,
+        skip_equivalent_swaps=skip_equivalent_swaps,
     )
 
 
 def temp_tester(
-    algorithm: SimulatedAnnealing, temperature: int, results: dict
+    algorithm: SimulatedAnnealing,
+    temperature: int,
+    results: dict,
+    instance: Optional[ProblemInstance] = None,
+    skip_equivalent_swaps: bool = False,
 ) -> None:
     """ "Wrapper function to compare temperatures.
 
@@ -67,6 +89,9 @@ def temp_tester(
         algorithm (SimulatedAnnealing): Does not actually do anything.
         temperature (int): temperature for cooling scheme.
         results (dict): a dictionary created by multiprocessing.Manager().dict().
+        instance (ProblemInstance): Optional data shared by pool_exe. Defaults to None.
+        skip_equivalent_swaps (bool): Evaluate if swaps between halls of equal capacity
+            in the same timeslot are redrawn. Defaults to False.
     """
     results[temperature] = random_restart(
         algorithm=algorithm,
@@ -74,10 +99,14 @@ def temp_tester(
         temperature=temperature,
         verbose=2,
         store_runs=True,
+        instance=instance,
+        skip_equivalent_swaps=skip_equivalent_swaps,
     )
 
 
-def pool_exe(target, algorithm, iterables) -> list[tuple[int, str]]:
+def pool_exe(
+    target, algorithm, iterables, skip_equivalent_swaps: bool = False
+) -> list[tuple[int, str]]:
     """Wrapper function to call multiprocessing.
 
     Allows for different values to be tested to be ran concurrently.
@@ -85,27 +114,40 @@ def pool_exe(target, algorithm, iterables) -> list[tuple[int, str]]:
 
     If 3 heuristics were given, 3 cores would be used.
 
+    The data is loaded once and shared with all processes through memory-mapped files,
+    see ProblemInstance.share().
+
     Source: https://stackoverflow.com/questions/10415028/how-to-get-the-return-value-of-a-function-passed-to-multiprocessing-process
 
     Args:
         target (function): function to be ran concurrently.
         algorithm (HillClimber | SimulatedAnnealing): Type of argument to test heuristics on.
         iterables (list[int | str]): Value which cores should concurrently process.
+        skip_equivalent_swaps (bool): Evaluate if swaps between halls of equal capacity
+            in the same timeslot are redrawn. Defaults to False.
 
     """
     manager = multiprocessing.Manager()
     results = manager.dict()
     jobs = []
 
-    for item in iterables:
-        p = multiprocessing.Process(
-            target=target, args=(algorithm, item, results)
-        )
-        jobs.append(p)
-        p.start()
-
-    for process in jobs:
-        process.join()
+    instance = ProblemInstance()
+    instance.share()
+
+    try:
+        for item in iterables:
+            p = multiprocessing.Process(
+                target=target,
+                args=(algorithm, item, results, instance, skip_equivalent_swaps),
+            )
+            jobs.append(p)
+            p.start()
+
+        for process in jobs:
+            process.join()
+    finally:
+        # Remove the memory-mapped files, also if a process failed to start or join.
+        instance.release()
 
     return results.items()
 
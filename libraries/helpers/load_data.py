@@ -10,30 +10,54 @@ A variable in a root dir script recieving the return from each loading function
 Loading the data in another folder may need adjustment of the path.
 
 This module contains the following functions:
+load_course_table -> dict[column name: array of values] of the courses in csv
+load_student_table -> DataFrame of the students in csv
+load_registry -> ActivityRegistry of all activities in the course table
+load_student_courses -> boolean students x courses matrix of enrollments
+stream_student_courses -> the same matrix, read from csv in chunks of rows
 load_courses -> dict[course name: Course object]
 load_students -> dict[index of student in csv: Student Object]
 load_halls -> dict[index of hall: Hall object]
+compile_data -> path of a binary snapshot of the three csv files
+load_tables -> course table, student-course incidence and halls, from the snapshot if up to date
+
+The table functions load the data in bulk. The Course and Student objects are only
+built from the tables by build_courses and build_students.
+
+pandas is only imported to parse the csv files, loading an up to date snapshot does not need it.
+
+Student enrollments are read from studenten_en_vakken.csv in one of two layouts:
+wide, one row per student with the courses in columns Vak1, Vak2, etc., or
+long, one row per student-course pair with the columns Stud.Nr. and Vak.
 """
 
-import pandas as pd
+from typing import Optional, TYPE_CHECKING
+import numpy as np
+import hashlib
 import csv
+import os
 from libraries.classes.course import Course
 from libraries.classes.activity import Activity
 from libraries.classes.student import Student
 from libraries.classes.hall import Hall
+from libraries.classes.activity_registry import ActivityRegistry
 
+if TYPE_CHECKING:
+    import pandas as pd
 
-def load_courses(path: str = "data"):
-    """Load courses from csv to a dictionary.
+SOURCE_FILES = ["vakken.csv", "studenten_en_vakken.csv", "zalen.csv"]
+SNAPSHOT_FILE = "instance.npz"
+
+
+def load_course_table(path: str = "data") -> "dict[str, np.ndarray]":
+    """Load courses from csv to a table, mapping each column name to an array of values.
 
     Args:
         path (str): path of csv to load.
             Defaults to "/data"
-
-    Returns:
-        dict: Contains courses and their activities.
-          key = coursename, value = Course obj.
     """
+    import pandas as pd
+
     d_type = {
         "Vak": str,
         "#Hoorcolleges": int,
@@ -45,8 +69,36 @@ def load_courses(path: str = "data"):
     }
     df_courses = pd.read_csv(f"{path}/vakken.csv", dtype=d_type)
 
+    return {column: df_courses[column].to_numpy() for column in df_courses.columns}
+
+
+def load_courses(path: str = "data"):
+    """Load courses from csv to a dictionary.
+
+    Args:
+        path (str): path of csv to load.
+            Defaults to "/data"
+
+    Returns:
+        dict: Contains courses and their activities.
+          key = coursename, value = Course obj.
+    """
+    return build_courses(load_course_table(path))
+
+
+def build_courses(course_table: "dict[str, np.ndarray]"):
+    """Build Course objects from the course table.
+
+    Args:
+        course_table (dict[str, np.ndarray]): Courses as loaded by load_course_table.
+
+    Returns:
+        dict: Contains courses and their activities.
+          key = coursename, value = Course obj.
+    """
     courses = {}
-    for _, course in df_courses.iterrows():
+    for index in range(len(course_table["Vak"])):
+        course = {column: values[index] for column, values in course_table.items()}
         courses[course["Vak"]] = Course(course_name=course["Vak"])
         for activities in _init_activities(courses[course["Vak"]], course):
             for activity_name, activity_set in activities.items():
@@ -56,12 +108,55 @@ def load_courses(path: str = "data"):
     return courses
 
 
-def _init_activities(course_obj: Course, course: pd.Series):
+def load_registry(course_table: "dict[str, np.ndarray]") -> ActivityRegistry:
+    """Assign an integer id to every activity of the course table.
+
+    Every course is registered, in order of the table. The activities of a course
+    are registered in the order of Course.activities(): lectures, practicals, tutorials.
+
+    Args:
+        course_table (dict[str, np.ndarray]): Courses as loaded by load_course_table.
+
+    Returns:
+        ActivityRegistry: Contains the ids and names of all activities.
+    """
+    categories = ["lecture", "practical", "tutorial"]
+    course_names = [str(name) for name in course_table["Vak"]]
+    counts = np.nan_to_num(
+        np.array(
+            [course_table[column] for column in ["#Hoorcolleges", "#Practica", "#Werkcolleges"]],
+            dtype=float,
+        ).T
+    ).astype(int)
+    n_per_category = counts.ravel()
+
+    # Course, category and number within the category of each activity.
+    activity_courses = np.repeat(np.arange(len(course_names)), counts.sum(axis=1))
+    activity_categories = np.repeat(
+        np.tile(np.arange(len(categories)), len(course_names)), n_per_category
+    )
+    first_of_category = np.cumsum(n_per_category) - n_per_category
+    activity_numbers = (
+        np.arange(len(activity_courses)) - np.repeat(first_of_category, n_per_category) + 1
+    )
+
+    registry = ActivityRegistry()
+    for course_name in course_names:
+        registry.add_course(course_name)
+    for course, category, number in zip(
+        activity_courses, activity_categories, activity_numbers
+    ):
+        registry.add(course_names[course], f"{categories[category]} {number}")
+
+    return registry
+
+
+def _init_activities(course_obj: Course, course: "dict[str, object]"):
     """Generate activity objects in list for a course.
 
     Args:
         course_obj (Course): Course object.
-        course (pd.Series): Row containing course data.
+        course (dict[str, object]): Row containing course data.
 
     Returns:
         tuple: list of lectures, list of tutorials, list of practicals.
@@ -72,29 +167,29 @@ def _init_activities(course_obj: Course, course: pd.Series):
 
     # Add lectures.
     lectures = {
-        "lectures": {Activity(
+        "lectures": [Activity(
             course=course_obj, category=f"lecture {i+1}", capacity=course["Verwacht"]
         )
-        for i in range(n_lectures)}
+        for i in range(n_lectures)]
     }
 
     # Add practicals.
     practicals = {
-        "practicals": {Activity(
+        "practicals": [Activity(
             course=course_obj,
             category=f"practical {i+1}",
             capacity=course["Max. stud. Practicum"],
         )
-        for i in range(n_practicals)}
+        for i in range(n_practicals)]
     }
     # Add tutorials.
     tutorials = {
-        "tutorials": {Activity(
+        "tutorials": [Activity(
             course=course_obj,
             category=f"tutorial {i+1}",
             capacity=course["Max. stud. Werkcollege"],
         )
-        for i in range(n_tutorials)}
+        for i in range(n_tutorials)]
     }
 
     return lectures, tutorials, practicals
@@ -112,15 +207,154 @@ def load_students(courses, path: str = "data"):
         dict: Contains courses and their activities.
           key = student index, value = Student obj.
     """
+    return build_students(courses, load_student_table(path))
+
+
+def load_student_table(path: str = "data") -> "pd.DataFrame":
+    """Load students from csv to a dataframe, one row per student.
+
+    A csv in the long layout is converted to the wide layout, with the students
+    in order of first appearance.
+
+    Args:
+        path (str): Path of csv to load.
+            Defaults to "/data"
+    """
+    import pandas as pd
+
     df_students = pd.read_csv(f"{path}/studenten_en_vakken.csv")
+    if "Vak" not in df_students.columns:
+        return df_students
+
+    # Number the courses of each student to form the columns Vak1, Vak2, etc.
+    df_enrollments = df_students.dropna(subset=["Vak"])
+    df_subjects = (
+        df_enrollments.assign(
+            subject=df_enrollments.groupby("Stud.Nr.", sort=False).cumcount() + 1
+        )
+        .pivot(index="Stud.Nr.", columns="subject", values="Vak")
+        .add_prefix("Vak")
+    )
+    df_info = df_students.drop(columns="Vak").drop_duplicates("Stud.Nr.")
+
+    return df_info.join(df_subjects, on="Stud.Nr.").reset_index(drop=True)
+
 
+def load_student_courses(
+    df_students: "pd.DataFrame", registry: ActivityRegistry
+) -> np.ndarray:
+    """Return a boolean students x courses matrix of the enrollments in the student table.
+
+    The course names in the Vak columns are translated to course ids of the registry at once.
+    Empty columns and unknown courses are ignored.
+
+    Args:
+        df_students (pd.DataFrame): Students as loaded by load_student_table.
+        registry (ActivityRegistry): Registry of which the course ids are used as columns.
+    """
+    import pandas as pd
+
+    subjects = df_students[_subject_columns(df_students.columns)].to_numpy()
+    course_ids = (
+        pd.Index(registry.course_names)
+        .get_indexer(subjects.ravel())
+        .reshape(subjects.shape)
+    )
+
+    student_courses = np.zeros((len(df_students), len(registry.course_names)), dtype=bool)
+    students, columns = np.nonzero(course_ids >= 0)
+    student_courses[students, course_ids[students, columns]] = True
+
+    return student_courses
+
+
+def stream_student_courses(
+    registry: ActivityRegistry, path: str = "data", chunksize: int = 100_000
+) -> np.ndarray:
+    """Return a boolean students x courses matrix of the enrollments in studenten_en_vakken.csv.
+
+    The csv is read in chunks of rows, only the matrix is kept between chunks.
+    Wide and long layouts are both supported. In the long layout the students are
+    indexed in order of first appearance of their Stud.Nr., which is read as text,
+    so student numbers need not be integers. Rows without a Stud.Nr. belong to a
+    single student.
+
+    Args:
+        registry (ActivityRegistry): Registry of which the course ids are used as columns.
+        path (str): Path of csv to load.
+            Defaults to "/data"
+        chunksize (int): Number of rows to read at once. Defaults to 100000.
+    """
+    import pandas as pd
+
+    course_index = pd.Index(registry.course_names)
+    student_courses = np.zeros((0, len(registry.course_names)), dtype=bool)
+    n_students = 0
+    # Student numbers in order of first appearance, only used for the long layout.
+    known_numbers = pd.Index([], dtype=object)
+
+    for chunk in pd.read_csv(
+        f"{path}/studenten_en_vakken.csv",
+        chunksize=chunksize,
+        dtype={"Stud.Nr.": str},
+    ):
+        if "Vak" in chunk.columns:
+            numbers = chunk["Stud.Nr."]
+            new_numbers = numbers[~numbers.isin(known_numbers)].unique()
+            known_numbers = known_numbers.append(pd.Index(new_numbers, dtype=object))
+            students = known_numbers.get_indexer(numbers)
+            course_ids = course_index.get_indexer(chunk["Vak"])
+            n_students = len(known_numbers)
+            student_courses = _grow_rows(student_courses, n_students)
+            enrolled = course_ids >= 0
+            student_courses[students[enrolled], course_ids[enrolled]] = True
+        else:
+            student_courses = _grow_rows(student_courses, n_students + len(chunk))
+            student_courses[n_students : n_students + len(chunk)] = load_student_courses(
+                chunk, registry
+            )
+            n_students += len(chunk)
+
+    # Copy to release the rows reserved for growth.
+    return student_courses[:n_students].copy()
+
+
+def _grow_rows(matrix: np.ndarray, n_rows: int) -> np.ndarray:
+    """Return matrix with room for at least n_rows rows, doubling its size if needed."""
+    if n_rows <= len(matrix):
+        return matrix
+    grown = np.zeros((max(n_rows, 2 * len(matrix)), matrix.shape[1]), dtype=matrix.dtype)
+    grown[: len(matrix)] = matrix
+
+    return grown
+
+
+def _subject_columns(columns) -> list[str]:
+    """Return the course columns Vak1, Vak2, etc. of the columns of a wide student table."""
+    return [
+        column
+        for column in columns
+        if column.startswith("Vak") and column[3:].isdigit()
+    ]
+
+
+def build_students(courses, df_students: "pd.DataFrame"):
+    """Build Student objects from the student table and add them to their courses.
+
+    Args:
+        courses (dict): Dictionary of all courses.
+        df_students (pd.DataFrame): Students as loaded by load_student_table.
+
+    Returns:
+        dict: key = student index, value = Student obj.
+    """
     students = {}
     for index, student in df_students.iterrows():
         subjects = _load_subjects(courses, student)
         students[index] = Student(
             index=index,
-            first_name=student["Voornaam"],
-            last_name=student["Achternaam"],
+            first_name=student.get("Voornaam"),
+            last_name=student.get("Achternaam"),
             student_number=student["Stud.Nr."],
             courses=subjects,
         )
@@ -131,9 +365,9 @@ def load_students(courses, path: str = "data"):
 
 def _load_subjects(courses, student):
     return {
-        student[f"Vak{i+1}"]: courses[student[f"Vak{i+1}"]]
-        for i in range(5)
-        if isinstance(student[f"Vak{i+1}"], str)
+        student[column]: courses[student[column]]
+        for column in _subject_columns(student.index)
+        if isinstance(student[column], str)
     }
 
 
@@ -157,4 +391,128 @@ def load_halls(path: str = "data"):
         hall_name, capacity = hall.values()
         halls.update({index: Hall(hall_name, int(capacity))})
 
-    return halls
\ No newline at end of file
+    return halls
+
+
+def hash_sources(path: str = "data") -> str:
+    """Return a sha256 hash of the contents of the three csv files in path."""
+    source_hash = hashlib.sha256()
+    for file_name in SOURCE_FILES:
+        with open(f"{path}/{file_name}", mode="rb") as file:
+            # Hash in blocks of 1 MiB, so a large file is not read into memory at once.
+            for block in iter(lambda: file.read(1 << 20), b""):
+                source_hash.update(block)
+
+    return source_hash.hexdigest()
+
+
+def compile_data(path: str = "data") -> str:
+    """Compile the three csv files in path into a single binary snapshot.
+
+    The snapshot stores the course table, the students x courses incidence matrix
+    and the halls as NumPy arrays, together with the hash of the csv files it was
+    compiled from. load_tables loads the snapshot instead of the csv files while the
+    hash matches.
+
+    Args:
+        path (str): Path of the csv files. The snapshot is written to the same path.
+            Defaults to "/data"
+
+    Returns:
+        str: Path of the written snapshot.
+    """
+    course_table = load_course_table(path)
+    student_courses = stream_student_courses(load_registry(course_table), path)
+    halls = load_halls(path)
+    arrays = {
+        "source_hash": np.array(hash_sources(path)),
+        "student_courses": student_courses,
+        "hall_names": np.array([hall.name for hall in halls.values()]),
+        "hall_capacities": np.array([hall.capacity for hall in halls.values()]),
+        **_table_to_arrays("course", course_table),
+    }
+
+    snapshot_path = f"{path}/{SNAPSHOT_FILE}"
+    # np.savez appends .npz to a file name that lacks the extension.
+    with open(snapshot_path, mode="wb") as file:
+        np.savez(file, **arrays)
+
+    return snapshot_path
+
+
+def load_tables(
+    path: str = "data",
+) -> "tuple[dict[str, np.ndarray], np.ndarray, dict[int, Hall]]":
+    """Load the course table, the students x courses incidence matrix and the halls of path.
+
+    The compiled snapshot is loaded if it exists and its hash matches the csv files,
+    otherwise the csv files are parsed.
+    The columns of the incidence matrix follow the order of the course table,
+    which is the order of the course ids of load_registry.
+
+    Args:
+        path (str): Path of the csv files and the snapshot.
+            Defaults to "/data"
+    """
+    snapshot = load_snapshot(path)
+    if snapshot is None:
+        course_table = load_course_table(path)
+        student_courses = stream_student_courses(load_registry(course_table), path)
+        return course_table, student_courses, load_halls(path)
+
+    halls = {
+        index: Hall(str(name), int(capacity))
+        for index, (name, capacity) in enumerate(
+            zip(snapshot["hall_names"], snapshot["hall_capacities"])
+        )
+    }
+    return _arrays_to_table("course", snapshot), snapshot["student_courses"], halls
+
+
+def load_snapshot(path: str = "data") -> "Optional[dict[str, np.ndarray]]":
+    """Return the arrays of the compiled snapshot in path.
+
+    Returns None if there is no snapshot or if it is out of date with the csv files.
+    """
+    snapshot_path = f"{path}/{SNAPSHOT_FILE}"
+    if not os.path.exists(snapshot_path):
+        return None
+
+    with np.load(snapshot_path, allow_pickle=False) as snapshot:
+        if str(snapshot["source_hash"]) != hash_sources(path):
+            return None
+        return {name: snapshot[name] for name in snapshot.files}
+
+
+def _table_to_arrays(
+    prefix: str, table: "dict[str, np.ndarray]"
+) -> "dict[str, np.ndarray]":
+    """Convert the columns of a table to arrays without object dtype.
+
+    Missing text values are stored as empty strings.
+    """
+    arrays = {f"{prefix}_columns": np.array(list(table), dtype=str)}
+    for i, values in enumerate(table.values()):
+        if values.dtype.kind in "biuf":
+            arrays[f"{prefix}_{i}"] = values
+        else:
+            arrays[f"{prefix}_{i}"] = np.array(
+                [value if isinstance(value, str) else "" for value in values], dtype=str
+            )
+
+    return arrays
+
+
+def _arrays_to_table(
+    prefix: str, arrays: "dict[str, np.ndarray]"
+) -> "dict[str, np.ndarray]":
+    """Convert arrays stored by _table_to_arrays back to a table."""
+    table = {}
+    for i, column in enumerate(arrays[f"{prefix}_columns"]):
+        values = arrays[f"{prefix}_{i}"]
+        if values.dtype.kind == "U":
+            # Restore missing text values.
+            values = np.where(values == "", None, values.astype(object))
+        table[str(column)] = values
+
+    return table
@@ -1,15 +1,14 @@
 from libraries.classes.model import Model
-import pandas as pd
 from tabulate import tabulate
 
 def print_results(algorithm_name: str, model: Model, runtime):
     """
     Prints results of a model generated with an algorithm.
     """
-    model_df = model_to_df(model)
+    model_rows = model_to_rows(model)
     print(
         f"THE BEST SCHEDULE FOUND WHEN USING {algorithm_name}:\n",
-        tabulate(model_df, tablefmt='psql', headers='keys', showindex=False),
+        tabulate(model_rows, tablefmt='psql', headers='keys', showindex=False),
         "\n POINTS: ",
         model.calc_total_penalty(),
         "\n evening points:",
@@ -24,22 +23,30 @@ def print_results(algorithm_name: str, model: Model, runtime):
 
 def model_to_df(model:Model):
     """Converts model object to a pandas dataframe for pretty printing."""
+    import pandas as pd
+
+    return pd.DataFrame(model_to_rows(model))
+
+def model_to_rows(model:Model) -> list[dict]:
+    """Converts model object to a list of rows for pretty printing, one row per index."""
 
     # create a list of weekdays (column headers)
-    weekdays = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+    weekdays = model.geometry.day_names
 
     # create a list of timeslots (row headers)
-    timeslots = ["9-11", "11-13", "13-15", "15-17", "17-19"]
+    timeslots = model.geometry.timeslot_names
 
     # formatting
     list_of_dicts = []
-    for i in range(len(model.solution)):
+    solution = model.solution
+    for i in range(len(solution)):
         info = model.translate_index(i)
         day  = weekdays[info['day']]
         time = timeslots[info['timeslot']]
         hall = model.halls[info['hall']].name
-        activity = model.solution[i]
-        students = model.activity_enrollments[activity] if activity[0] else None
+        activity = solution[i]
+        id = model.get_activity_of_index(i)
+        students = model.activity_enrollments[id] if id >= 0 else None
         list_of_dicts.append({
 
             'day':day,
@@ -49,5 +56,4 @@ def model_to_df(model:Model):
             '#students': len(students) if students else ''
         })
 
-    # convert to df
-    return pd.DataFrame(list_of_dicts)
\ No newline at end of file
+    return list_of_dicts
\ No newline at end of file
@@ -1,45 +1,39 @@
-from libraries.helpers.load_data import load_halls
 from libraries.classes.model import Model
 import pandas as pd
 import tkinter as tk
 from tkinter import ttk
 
 
-def create_df(schedule: dict) -> pd.DataFrame:
-    """Takes a schedule dictionary and converts it to a pandas dataframe.
+def create_df(model: Model) -> pd.DataFrame:
+    """Takes the schedule of a model and converts it to a pandas dataframe.
 
     Args:
-        schedule (dict): A schedule dictionary with indices 0-144 mapping to activity tuples or None.
+        model (Model): A model of which the schedule slot indices map to activities.
+            The day, timeslot and hall of an index are read from the model geometry.
 
     Return:
         pd.DataFrame: A dataframe with weekdays as column headers, timeslots as row headers and activities
             filled in the schedule on the correct day and timeslot.
     """
 
-    weekdays = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
-    timeslots = ["9-11", "11-13", "13-15", "15-17", "17-19"]
-    halls = load_halls()
+    weekdays = model.geometry.day_names
+    timeslots = model.geometry.timeslot_names
+    halls = model.halls
 
     # Create an empty DataFrame
     df = pd.DataFrame(index=timeslots, columns=weekdays)
 
     # Iterate over the dictionary and populate the DataFrame
-    for index, (course, lecture) in schedule.items():
+    for index, (course, lecture) in model.solution.items():
         if course is not None and lecture is not None:
-            day = index // 29
-            timeslot_index = (index % 29) // 7
-            if (index % 29) == 28:
-                # Evening slot exception.
-                hall = 5
-            else:
-                # Regular hall indexing.
-                hall = (index % 29) % 7
+            slot = model.translate_index(index)
 
             # Map the timeslot index to the corresponding timeslot
-            timeslot = timeslots[timeslot_index]
+            timeslot = timeslots[slot["timeslot"]]
 
             # Map the location to the corresponding weekday
-            weekday = weekdays[day]
+            weekday = weekdays[slot["day"]]
+            hall = slot["hall"]
 
             value = f"{course}\n- {lecture}, {halls[hall]}"
 
@@ -106,8 +100,8 @@ def visualize_schedule(model: Model) -> None:
     """Visualizes a schedule in a pop up window.
 
     Args:
-        schedule (dict): A schedule dictionary with indices 0-144 that map to activity tuples.
+        model (Model): The model of which the schedule is shown.
     """
 
-    df = create_df(model.solution)
+    df = create_df(model)
     tkinter_pop_up(df)
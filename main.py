@@ -1,19 +1,24 @@
 from libraries.algorithms.randomise import Random
 from libraries.classes.model import Model
-from libraries.helpers.print_results import print_results
-from libraries.helpers.save_greedy_run import to_csv
-from libraries.helpers.score_histogram import plot_histogram
-from libraries.helpers.visualize import visualize_schedule
 from libraries.algorithms.greedy import Greedy, RandomGreedy
 from libraries.algorithms.beam_search import BeamSearch
 from libraries.algorithms.hillclimber import HillClimber
 from libraries.algorithms.simulated_annealing import SimulatedAnnealing
 from libraries.algorithms.random_restart import random_restart
+from libraries.helpers.load_data import compile_data
 import argparse
 import random
 import time
 
-def main(algorithm, runs, heuristic, save, visualize):
+# Reporting, plotting and GUI helpers (tabulate, pandas, matplotlib, scipy, tkinter)
+#   are imported where they are used, so a headless run does not load them.
+
+def main(algorithm, runs, heuristic, save, visualize, skip_equivalent_swaps=False):
+    # _________________________COMPILE DATA____________________________________________
+    if algorithm == "compile":
+        print(f"Data compiled to {compile_data()}")
+        return
+
     random.seed(0)
     empty_model = Model()
 
@@ -32,9 +37,13 @@ def main(algorithm, runs, heuristic, save, visualize):
         random_algorithm.run(runs=runs, verbose=True)
         runtime = time.time() - start_time
 
+        from libraries.helpers.print_results import print_results
+
         print_results("random", random_algorithm.best_model, runtime)
 
         if visualize:
+            from libraries.helpers.visualize import visualize_schedule
+
             visualize_schedule(random_algorithm.initial_model)
 
     # ________________________BEAM SEARCH ALGORITHM____________________________________
@@ -48,9 +57,13 @@ def main(algorithm, runs, heuristic, save, visualize):
 
         # visualize(beam_search.initial_model)
 
+        from libraries.helpers.print_results import print_results
+
         print_results("beam search", beam_search.initial_model, runtime)
 
         if visualize:
+            from libraries.helpers.visualize import visualize_schedule
+
             visualize_schedule(beam_search.initial_model)
 
     # ______________________HILLCLIMBER & SIMULATED ANNEALING___________________________
@@ -58,12 +71,17 @@ def main(algorithm, runs, heuristic, save, visualize):
         start_time = time.time()
         best_model = random_restart(
             algorithms[algorithm], heuristics=heuristic, verbose=2, runs=runs, save=save,
+            skip_equivalent_swaps=skip_equivalent_swaps,
         )
         runtime = time.time() - start_time
 
+        from libraries.helpers.print_results import print_results
+
         print_results(f"{algorithm}", best_model, runtime)
 
         if visualize:
+            from libraries.helpers.visualize import visualize_schedule
+
             visualize_schedule(best_model)
 
     # ________________________GREEDY & RANDOMGREEDY ALGORITHM____________________________
@@ -90,11 +108,15 @@ def main(algorithm, runs, heuristic, save, visualize):
                 greedy_best = greedy_result.copy()
             
             if save:
+                from libraries.helpers.save_greedy_run import to_csv
+
                 to_csv(
                     greedy_result, runtime, run_number, heuristic,
                     filename=f"{algorithm}_{heuristic}_{runs}runs",
                 )
 
+        from libraries.helpers.print_results import print_results
+
         print_results(algorithm, greedy_best, runtime)
         print(f"{runs} run(s) finished.")
 
@@ -104,6 +126,8 @@ def main(algorithm, runs, heuristic, save, visualize):
             )
 
         if visualize:
+            from libraries.helpers.visualize import visualize_schedule
+
             visualize_schedule(greedy_best)
 
     # __________________________BASELINE_______________________________________________
@@ -123,6 +147,8 @@ def main(algorithm, runs, heuristic, save, visualize):
         print(f'Baseline of {runs*100} runs finished. Results saved in ./results/baseline{runs*100}runs.txt')
         
         if save:
+            from libraries.helpers.score_histogram import plot_histogram
+
             plot_histogram(
                 data_file=f'./results/baseline_{runs*100}runs.txt', 
                 output_path='./images/', 
@@ -133,7 +159,7 @@ def main(algorithm, runs, heuristic, save, visualize):
     # invalid command
     else:
         print(
-            "Error: Command must be one of the following: [random, beam_search, hillclimber, simulated_annealing, greedy, random_greedy]"
+            "Error: Command must be one of the following: [random, beam_search, hillclimber, simulated_annealing, greedy, random_greedy, baseline, compile]"
         )
         return
 
@@ -154,6 +180,12 @@ if __name__ == "__main__":
     parser.add_argument(
         "-v", "--visualize", action="store_true", help="visualizes schedule in pop up"
     )
+    parser.add_argument(
+        "-e",
+        "--skip-equivalent",
+        action="store_true",
+        help="skips swaps between halls of equal capacity in the same timeslot",
+    )
 
     # read arguments from command line
     args = parser.parse_args()
@@ -165,4 +197,11 @@ if __name__ == "__main__":
         args.heuristics = args.heuristics[0]
 
     # run main with provided arguments
-    main(args.algorithm, args.n, args.heuristics, args.save, args.visualize)
\ No newline at end of file
+    main(
+        args.algorithm,
+        args.n,
+        args.heuristics,
+        args.save,
+        args.visualize,
+        args.skip_equivalent,
+    )
\ No newline at end of file